@@ -0,0 +1,217 @@
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# Compact record types and streaming result sinks for bulk runs.
+#
+# A large import should not keep every input dict, payload and response
+# JSON alive until the end. Inputs are read one at a time into slotted
+# StoryRecords, each result is reduced to a slotted ResultRecord and handed
+# to a sink (any callable, e.g. an NdjsonSink) instead of being collected
+# into a list, and only a bounded number of requests are in flight. Memory
+# use stays roughly constant regardless of the number of issues.
+
+
+class StoryRecord:
+    """One story to create (same optional fields as create_story)"""
+
+    __slots__ = ("project_key", "summary", "description", "priority",
+                 "labels", "assignee", "issue_type", "parent")
+
+    def __init__(self, project_key, summary, description="", priority=None,
+                 labels=None, assignee=None, issue_type="Story", parent=None):
+        self.project_key = project_key
+        self.summary = summary
+        self.description = description
+        self.priority = priority
+        self.labels = tuple(labels) if labels else None
+        self.assignee = assignee
+        self.issue_type = issue_type
+        self.parent = parent
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from an input dict as used by the JSON ticket files"""
+        return cls(
+            data['project_key'],
+            data['summary'],
+            data.get('description', ''),
+            data.get('priority'),
+            data.get('labels'),
+            data.get('assignee'),
+            data.get('issue_type', 'Story'),
+            data.get('parent'),
+        )
+
+    def fields(self, creator):
+        """Build the create payload fields with creator.build_fields"""
+        optional = {"issue_type": self.issue_type}
+        if self.priority:
+            optional["priority"] = self.priority
+        if self.labels:
+            optional["labels"] = list(self.labels)
+        if self.assignee:
+            optional["assignee"] = self.assignee
+        if self.parent:
+            optional["parent"] = self.parent
+        return creator.build_fields(self.project_key, self.summary, self.description, **optional)
+
+
+class ResultRecord:
+    """Outcome of one bulk operation, without the full response body"""
+
+    __slots__ = ("index", "key", "status", "error")
+
+    def __init__(self, index, key=None, status=None, error=None):
+        self.index = index    # Position of the input in the run
+        self.key = key        # Issue key (or attachment id) on success
+        self.status = status  # HTTP status, None if the request never completed
+        self.error = error    # Error text on failure
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def to_dict(self):
+        return {"index": self.index, "key": self.key, "status": self.status, "error": self.error}
+
+    def __repr__(self):
+        return f"ResultRecord({self.to_dict()})"
+
+
+class NdjsonSink:
+    """Result sink that appends one JSON line per ResultRecord to a file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self.failed = 0
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, record):
+        self._file.write(json.dumps(record.to_dict(), separators=(",", ":")) + "\n")
+        self.written += 1
+        if not record.ok:
+            self.failed += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_story_records(json_file_path):
+    """
+    Read stories one at a time.
+
+    NDJSON files (one story per line) are streamed; a plain JSON file
+    (a single story or a list) has to be loaded whole first.
+
+    Yields:
+        StoryRecord
+    """
+    with open(json_file_path, 'r', encoding="utf-8") as file:
+        first = file.read(1)
+        while first and first.isspace():
+            first = file.read(1)
+        file.seek(0)
+
+        if first == "{":
+            # One object per line; fall back to a single pretty-printed object
+            lines = iter(file)
+            line = next(lines, "")
+            try:
+                story = json.loads(line)
+            except ValueError:
+                file.seek(0)
+                story = json.load(file)
+                lines = iter(())
+            yield StoryRecord.from_dict(story)
+            for line in lines:
+                if line.strip():
+                    yield StoryRecord.from_dict(json.loads(line))
+            return
+
+        data = json.load(file)
+
+    for item in data:
+        yield StoryRecord.from_dict(item)
+
+
+def _create_one(creator, index, record):
+    try:
+        response = creator._send(
+            "POST",
+            f"{creator.jira_url}/rest/api/2/issue",
+            headers=creator.headers,
+            data=creator._encode({"fields": record.fields(creator)}),
+            timeout=10
+        )
+    except Exception as e:
+        return ResultRecord(index, error=str(e))
+
+    if response.status_code == 201:
+        return ResultRecord(index, key=response.json().get("key"), status=201)
+    return ResultRecord(index, status=response.status_code, error=response.text)
+
+
+def bulk_create_stories(creator, records, sink, max_workers=None):
+    """
+    Create stories from an iterable of StoryRecords with constant memory.
+
+    Args:
+        creator:     JiraStoryCreator
+        records:     Iterable of StoryRecord (e.g. iter_story_records(path))
+        sink:        Callable receiving each ResultRecord as it completes
+        max_workers: Requests in flight at once (defaults to creator.pool_size)
+
+    Returns:
+        (created, failed) counts
+    """
+    max_workers = max_workers or creator.pool_size
+    created = failed = 0
+    in_flight = set()
+
+    def drain(done):
+        nonlocal created, failed
+        for future in done:
+            result = future.result()
+            if result.ok:
+                created += 1
+            else:
+                failed += 1
+            sink(result)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for index, record in enumerate(records):
+            # Only read the next input once there is room for it
+            if len(in_flight) >= max_workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                drain(done)
+            in_flight.add(executor.submit(_create_one, creator, index, record))
+
+        drain(wait(in_flight).done)
+
+    print(f"✓ Created {created} stories ({failed} failed)")
+    return created, failed
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+
+    from create_story_with_table_comments_attachments import JiraStoryCreator
+
+    creator = JiraStoryCreator(
+        jira_url="https://your-server:8443",
+        pat_token="your-personal-access-token",
+        cert_path="/path/to/certificate.pem"
+    )
+
+    if creator.test_connection():
+        with NdjsonSink("jira_results.ndjson") as sink:
+            bulk_create_stories(creator, iter_story_records("jira_tickets.ndjson"), sink)
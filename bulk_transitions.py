@@ -0,0 +1,208 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bulk_records import ResultRecord
+from create_story_with_table_comments_attachments import JiraStoryCreator
+
+
+# Move many issues to another status.
+#
+# Transition IDs depend on the workflow, so they are looked up once per
+# (project, issue type, current status) and cached, instead of a GET
+# /transitions for every issue. Current states come from batched key
+# searches (creator.search_keys) that only ask for the fields needed for
+# grouping. Transitions then run
+# concurrently; set max_requests_per_second on the JiraStoryCreator to keep
+# them under a shared rate limit.
+
+class TransitionCache:
+    """Transitions available per (project, issue type, status), thread safe"""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def get(self, creator, route, sample_key):
+        """
+        Transitions for a route, fetched from sample_key the first time.
+
+        Returns:
+            List of transition dicts ({'id', 'name', 'to': {'name', ...}})
+        """
+        with self._lock:
+            if route in self._routes:
+                return self._routes[route]
+
+        response = creator._send(
+            "GET",
+            f"{creator.jira_url}/rest/api/2/issue/{sample_key}/transitions",
+            headers=creator.headers,
+            timeout=10
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code}: {response.text}")
+
+        transitions = response.json().get("transitions", [])
+        with self._lock:
+            self._routes[route] = transitions
+        return transitions
+
+
+def find_transition(transitions, target):
+    """Match a transition by name or by the status it leads to (case-insensitive)"""
+    target = target.lower()
+    for transition in transitions:
+        if transition.get("name", "").lower() == target:
+            return transition
+    for transition in transitions:
+        if transition.get("to", {}).get("name", "").lower() == target:
+            return transition
+    return None
+
+
+def _group_by_route(creator, index_of):
+    """
+    Look up project, issue type and status for every key.
+
+    Args:
+        index_of: Dict of requested key -> input index
+
+    Returns:
+        (routes, missing): dict of route -> list of (input index, current key),
+        and requested keys that were not found
+    """
+    routes = {}
+    missing = []
+
+    for key, issue in creator.search_keys(index_of, fields=("project", "issuetype", "status")):
+        if issue is None:
+            missing.append(key)
+            continue
+        fields = issue["fields"]
+        route = (fields["project"]["key"], fields["issuetype"]["id"], fields["status"]["id"])
+        routes.setdefault(route, []).append((index_of[key], issue["key"]))
+
+    return routes, missing
+
+
+def _transition_one(creator, index, issue_key, transition_id):
+    try:
+        response = creator._send(
+            "POST",
+            f"{creator.jira_url}/rest/api/2/issue/{issue_key}/transitions",
+            headers=creator.headers,
+            data=creator._encode({"transition": {"id": transition_id}}),
+            timeout=10
+        )
+    except Exception as e:
+        return ResultRecord(index, key=issue_key, error=str(e))
+
+    if response.status_code == 204:
+        return ResultRecord(index, key=issue_key, status=204)
+    return ResultRecord(index, key=issue_key, status=response.status_code, error=response.text)
+
+
+def bulk_transition(creator, issue_keys, target, cache=None, max_workers=None, sink=None):
+    """
+    Transition many issues to a target status.
+
+    Args:
+        creator:     JiraStoryCreator
+        issue_keys:  List of issue keys (case-insensitive)
+        target:      Transition name or destination status name (e.g. 'Done')
+        cache:       TransitionCache to reuse across calls
+        max_workers: Transitions in flight at once (defaults to creator.pool_size)
+        sink:        Optional callable receiving each ResultRecord; when omitted
+                     the records are collected and returned
+
+    Returns:
+        List of ResultRecord in input order, one per input key (or (moved,
+        failed) counts with a sink). A moved issue's record carries its
+        current key; a repeated key is transitioned once and its later
+        occurrences get a 'Duplicate' record that is not counted as failed.
+    """
+    cache = cache or TransitionCache()
+    max_workers = max_workers or creator.pool_size
+    index_of = {}
+    duplicates = []
+    for i, key in enumerate(issue_keys):
+        key = key.strip().upper()
+        if key in index_of:
+            duplicates.append(ResultRecord(i, key=key, error=f"Duplicate of input {index_of[key]}"))
+        else:
+            index_of[key] = i
+    results = []
+    emit = sink or results.append
+    moved = failed = 0
+
+    def report(record):
+        nonlocal moved, failed
+        if record.ok:
+            moved += 1
+        else:
+            failed += 1
+        emit(record)
+
+    for record in duplicates:
+        emit(record)
+
+    try:
+        routes, missing = _group_by_route(creator, index_of)
+    except Exception as e:
+        print(f"✗ Failed to look up issues: {e}")
+        for key, index in index_of.items():
+            report(ResultRecord(index, key=key, error=str(e)))
+        return (moved, failed) if sink else sorted(results, key=lambda record: record.index)
+
+    for key in missing:
+        report(ResultRecord(index_of[key], key=key, error="Issue not found"))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for route, issues in routes.items():
+            try:
+                transition = find_transition(cache.get(creator, route, issues[0][1]), target)
+            except Exception as e:
+                transition, error = None, f"Failed to load transitions: {e}"
+            else:
+                error = f"No transition to '{target}' from this status"
+
+            if transition is None:
+                for index, key in issues:
+                    report(ResultRecord(index, key=key, error=error))
+                continue
+
+            futures.extend(
+                executor.submit(_transition_one, creator, index, key, transition["id"])
+                for index, key in issues
+            )
+
+        for future in futures:
+            report(future.result())
+
+    print(f"✓ Transitioned {moved} issues to '{target}' ({failed} failed)")
+    if duplicates:
+        print(f"  Skipped {len(duplicates)} duplicate keys")
+
+    if sink:
+        return moved, failed
+    return sorted(results, key=lambda record: record.index)
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+
+    creator = JiraStoryCreator(
+        jira_url="https://your-server:8443",
+        pat_token="your-personal-access-token",
+        cert_path="/path/to/certificate.pem",
+        max_requests_per_second=20
+    )
+
+    if creator.test_connection():
+        results = bulk_transition(creator, ["PROJ-101", "PROJ-102", "PROJ-103"], "In Progress")
+
+        for record in results:
+            if not record.ok:
+                print(f"  ✗ {record.key}: {record.error}")
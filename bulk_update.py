@@ -0,0 +1,184 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from bulk_records import ResultRecord
+from create_story_with_table_comments_attachments import JiraStoryCreator
+
+
+# Bring many issues to a desired field state, writing only what differs.
+#
+# Current values are read with batched key searches (creator.search_keys)
+# that ask only for the fields being synced. Each issue's desired state is diffed against them
+# into the minimal 'update' operations (label add/remove rather than a
+# full replace), and only issues with a non-empty diff are written, in
+# parallel. A nightly sync where nothing changed costs a few searches and
+# no writes.
+
+# Fields whose value is an object identified by name
+NAMED_FIELDS = ("priority", "assignee")
+
+# Fields whose value is a list of objects identified by name
+NAMED_LIST_FIELDS = ("components", "fixVersions", "versions")
+
+
+def compute_update(current, desired):
+    """
+    Diff desired field values against the current ones.
+
+    Args:
+        current: Issue 'fields' dict as returned by a search
+        desired: Dict of field -> desired value, e.g.
+                   {'labels': ['backend', 'nightly'], 'priority': 'High',
+                    'assignee': 'john.doe', 'summary': 'New title'}
+                 labels is the full desired set; assignee None means unassigned;
+                 components/fixVersions/versions are lists of names
+
+    Returns:
+        'update' dict for PUT /issue/{key}; empty when nothing differs
+
+    Raises:
+        ValueError: for any other field whose current value is an object or
+                    list (e.g. a custom select), which cannot be compared
+                    with a plain value or written with a plain 'set'
+    """
+    update = {}
+
+    for field, value in desired.items():
+        if field == "labels":
+            have = set(current.get("labels") or [])
+            want = set(value or [])
+            operations = [{"add": label} for label in sorted(want - have)]
+            operations += [{"remove": label} for label in sorted(have - want)]
+            if operations:
+                update["labels"] = operations
+
+        elif field in NAMED_FIELDS:
+            have = (current.get(field) or {}).get("name")
+            if have != value:
+                update[field] = [{"set": {"name": value} if value is not None else None}]
+
+        elif field in NAMED_LIST_FIELDS:
+            have = sorted(item.get("name") for item in current.get(field) or [])
+            if have != sorted(value or []):
+                update[field] = [{"set": [{"name": name} for name in value or []]}]
+
+        elif isinstance(current.get(field), (dict, list)):
+            raise ValueError(f"Unsupported field for bulk_update: {field}")
+
+        elif current.get(field) != value:
+            update[field] = [{"set": value}]
+
+    return update
+
+
+def _update_one(creator, index, issue_key, update):
+    try:
+        response = creator._send(
+            "PUT",
+            f"{creator.jira_url}/rest/api/2/issue/{issue_key}",
+            headers=creator.headers,
+            data=creator._encode({"update": update}),
+            timeout=10
+        )
+    except Exception as e:
+        return ResultRecord(index, key=issue_key, error=str(e))
+
+    if response.status_code == 204:
+        return ResultRecord(index, key=issue_key, status=204)
+    return ResultRecord(index, key=issue_key, status=response.status_code, error=response.text)
+
+
+def bulk_update(creator, desired_states, max_workers=None, sink=None, dry_run=False):
+    """
+    Update many issues, skipping the ones already in the desired state.
+
+    Args:
+        creator:        JiraStoryCreator
+        desired_states: Dict of issue key (case-insensitive) -> desired fields
+                        (see compute_update)
+        max_workers:    Updates in flight at once (defaults to creator.pool_size)
+        sink:           Optional callable receiving a ResultRecord for every
+                        issue that was written or failed; when omitted the
+                        records are collected and returned
+        dry_run:        Compute and print the diffs without writing; issues
+                        that would be written are counted as 'would_update'
+
+    Returns:
+        Dict with 'updated', 'unchanged', 'failed' and 'would_update' counts
+        and, without a sink, 'results' (list of ResultRecord in input order).
+        A moved issue is updated under, and reported with, its current key.
+    """
+    max_workers = max_workers or creator.pool_size
+    desired_states = {key.strip().upper(): desired for key, desired in desired_states.items()}
+    issue_keys = list(desired_states)
+    index_of = {key: i for i, key in enumerate(issue_keys)}
+    fields = sorted({field for desired in desired_states.values() for field in desired})
+    results = []
+    emit = sink or results.append
+    summary = {"updated": 0, "unchanged": 0, "failed": 0, "would_update": 0}
+
+    def report(record):
+        summary["updated" if record.ok else "failed"] += 1
+        emit(record)
+
+    found = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        try:
+            for key, issue in creator.search_keys(issue_keys, fields=fields):
+                if issue is None:
+                    continue
+                found.add(key)
+                try:
+                    update = compute_update(issue["fields"], desired_states[key])
+                except ValueError as e:
+                    report(ResultRecord(index_of[key], key=issue["key"], error=str(e)))
+                    continue
+                if not update:
+                    summary["unchanged"] += 1
+                elif dry_run:
+                    summary["would_update"] += 1
+                    print(f"  {issue['key']}: {json.dumps(update)}")
+                else:
+                    futures.append(executor.submit(_update_one, creator, index_of[key],
+                                                   issue["key"], update))
+        except Exception as e:
+            print(f"✗ Failed to read current values: {e}")
+
+        for key in issue_keys:
+            if key not in found:
+                report(ResultRecord(index_of[key], key=key,
+                                    error="Issue not found or not read"))
+
+        for future in futures:
+            report(future.result())
+
+    if dry_run:
+        print(f"✓ Dry run: {summary['would_update']} issues would be updated, "
+              f"{summary['unchanged']} unchanged, {summary['failed']} failed")
+    else:
+        print(f"✓ Updated {summary['updated']} issues, {summary['unchanged']} unchanged, "
+              f"{summary['failed']} failed")
+
+    if sink is None:
+        summary["results"] = sorted(results, key=lambda record: record.index)
+    return summary
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+
+    creator = JiraStoryCreator(
+        jira_url="https://your-server:8443",
+        pat_token="your-personal-access-token",
+        cert_path="/path/to/certificate.pem",
+        max_requests_per_second=20
+    )
+
+    if creator.test_connection():
+        bulk_update(creator, {
+            "PROJ-101": {"labels": ["backend", "nightly"], "priority": "High"},
+            "PROJ-102": {"labels": ["frontend"], "assignee": "john.doe"},
+            "PROJ-103": {"priority": "Low", "assignee": None},
+        })
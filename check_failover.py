@@ -0,0 +1,80 @@
+import sys
+import time
+
+from create_story_with_table_comments_attachments import JiraStoryCreator
+from replay_traffic import start_stand_in
+
+
+# Check JiraStoryCreator's node failover and circuit breaker against two
+# local stand-in servers; no Jira needed.
+#
+# The primary stand-in fails every request. Traffic must move to the
+# secondary, the primary's circuit must stay open for the cooldown, then
+# exactly one trial request may reach it before the circuit closes again.
+# Finally a node that is no longer picked because it was slow must be
+# probed again once its measurement is older than health_ttl.
+
+
+def check_failover(cooldown=0.5, health_ttl=1.0):
+    """
+    Run the failover checks.
+
+    Returns:
+        True if every check passed
+    """
+    primary, primary_url = start_stand_in(status=503)
+    secondary, secondary_url = start_stand_in()
+    creator = JiraStoryCreator(primary_url, "stand-in-token", True, failover_urls=[secondary_url])
+    pool = creator.endpoints
+    pool.cooldown = cooldown
+    pool.health_ttl = health_ttl
+    checks = []
+
+    def check(name, passed):
+        checks.append(passed)
+        print(f"  {'✓' if passed else '✗'} {name}")
+
+    try:
+        check("Connection succeeds while one node is down", creator.test_connection())
+
+        for _ in range(5):
+            creator.search_page("project = PROJ")
+        check("Requests go to the healthy node while the circuit is open", primary.requests == 1)
+
+        primary.forced_status = None
+        time.sleep(cooldown)
+        trial, other = pool.select(), pool.select()
+        check("Half-open node gets exactly one trial request",
+              (trial, other) == (primary_url, secondary_url))
+
+        pool.record_success(trial, 0.001)
+        creator.search_page("project = PROJ")
+        check("Successful trial closes the circuit", primary.requests == 2)
+
+        # A slow spell makes the primary lose all traffic...
+        pool.record_success(primary_url, 5.0)
+        pool.record_success(secondary_url, 0.01)
+        picks = [pool.select() for _ in range(100)]
+        check("Slow node stops getting traffic", primary_url not in picks)
+
+        # ...until its measurement is stale and one request re-measures it
+        time.sleep(health_ttl)
+        creator.search_page("project = PROJ")
+        check("Stale node is probed again and its average restarts",
+              primary.requests == 3 and pool.latency[primary_url] < 1.0)
+    finally:
+        creator.close()
+        primary.shutdown()
+        secondary.shutdown()
+
+    print(f"{'✓' if all(checks) else '✗'} Failover check: {sum(checks)}/{len(checks)} passed")
+    return all(checks)
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+#
+#   python check_failover.py
+
+if __name__ == "__main__":
+
+    sys.exit(0 if check_failover() else 1)
@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from create_story_with_table_comments_attachments import JiraStoryCreator
+
+
+# Batch comments posted to many issues at once (e.g. a CI failure fanning
+# out to every linked ticket).
+#
+# Comments are gathered for a short window (or until max_batch are
+# waiting), then dispatched concurrently through the creator's pooled
+# session. Identical (issue, comment) pairs within one window are sent once
+# and every caller gets the same future.
+
+
+class CommentBatcher:
+    def __init__(self, creator, window=0.1, max_batch=100, max_workers=None):
+        """
+        Args:
+            creator:     JiraStoryCreator
+            window:      Seconds to gather comments before dispatching
+            max_batch:   Dispatch early once this many distinct comments wait
+            max_workers: Comments posted concurrently (defaults to creator.pool_size)
+        """
+        self.creator = creator
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or creator.pool_size)
+        self.deduplicated = 0
+
+        self._pending = {}  # (issue_key, comment) -> Future
+        self._window_end = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, issue_key, comment):
+        """
+        Queue a comment.
+
+        Returns:
+            Future resolving to the created comment dict, or None on failure
+            (same as add_comment)
+        """
+        key = (issue_key, comment)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("CommentBatcher is closed")
+
+            future = self._pending.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                return future
+
+            future = self._pending[key] = Future()
+            if self._window_end is None:
+                self._window_end = time.monotonic() + self.window
+            self._condition.notify()
+            return future
+
+    def _take_batch(self):
+        """Wait for the window to close (or the batch to fill) and take it"""
+        with self._condition:
+            while True:
+                if self._pending:
+                    remaining = self._window_end - time.monotonic()
+                    if remaining <= 0 or len(self._pending) >= self.max_batch or self._closed:
+                        break
+                    self._condition.wait(remaining)
+                elif self._closed:
+                    return None
+                else:
+                    self._condition.wait()
+
+            batch, self._pending = self._pending, {}
+            self._window_end = None
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+
+            for (issue_key, comment), future in batch.items():
+                self.executor.submit(self.creator.add_comment, issue_key, comment) \
+                    .add_done_callback(lambda done, future=future: self._resolve(future, done))
+
+    @staticmethod
+    def _resolve(future, done):
+        if done.exception() is not None:
+            future.set_exception(done.exception())
+        else:
+            future.set_result(done.result())
+
+    def close(self):
+        """Dispatch anything still waiting and wait for all comments to finish"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.executor.shutdown(wait=True)
+
+        if self.deduplicated:
+            print(f"✓ Skipped {self.deduplicated} duplicate comments")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+
+    creator = JiraStoryCreator(
+        jira_url="https://your-server:8443",
+        pat_token="your-personal-access-token",
+        cert_path="/path/to/certificate.pem"
+    )
+
+    if creator.test_connection():
+        affected = ["PROJ-101", "PROJ-102", "PROJ-103", "PROJ-101"]
+
+        with CommentBatcher(creator) as batcher:
+            futures = [batcher.add(key, "Nightly build 1234 failed: see CI logs.")
+                       for key in affected]
+
+        failed = sum(1 for future in futures if future.result() is None)
+        print(f"✓ Posted status to {len(set(affected))} issues ({failed} failed)")
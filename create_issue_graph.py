@@ -0,0 +1,260 @@
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from create_story_with_table_comments_attachments import JiraStoryCreator
+
+
+# Create an epic/story with its sub-tasks and issue links in one go.
+#
+# Issues are created level by level in dependency order: a node is only
+# created once its parent and everything it depends_on exist, so parent
+# keys can be filled in. Each level is sent through the bulk create
+# endpoint in chunks, with the chunks running in parallel. Links are
+# created concurrently once every issue exists.
+#
+# If anything fails, the returned IssueGraphState records what was created;
+# save it and pass it back in to resume without creating duplicates. A bulk
+# request that times out or fails with a 5xx may still have created some of
+# its issues, so every node carries a marker label; on resume, nodes that
+# were attempted before are first looked up by their marker.
+
+BULK_CREATE_LIMIT = 50  # Max issues per /issue/bulk request
+
+
+class IssueGraphState:
+    """Progress of a graph creation run: created keys, failures and links done"""
+
+    def __init__(self, keys=None, links_done=None, markers=None):
+        self.keys = dict(keys or {})          # node ref -> issue key
+        self.links_done = set(links_done or [])  # link indexes already created
+        self.markers = dict(markers or {})    # node ref -> marker label, once attempted
+        self.errors = {}                      # node ref or link index -> error
+
+    @property
+    def complete(self):
+        return not self.errors
+
+    def to_dict(self):
+        return {"keys": self.keys, "links_done": sorted(self.links_done),
+                "markers": self.markers, "errors": self.errors}
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(data.get("keys"), data.get("links_done"), data.get("markers"))
+
+
+def dependency_levels(nodes):
+    """
+    Group node refs into levels so every node comes after its dependencies.
+
+    A node depends on its 'parent' (when that is another node ref) and on
+    everything listed in 'depends_on'.
+
+    Returns:
+        List of lists of node refs
+    """
+    dependencies = {}
+    for ref, node in nodes.items():
+        deps = set(node.get("depends_on", []))
+        if node.get("parent") in nodes:
+            deps.add(node["parent"])
+        unknown = deps - nodes.keys()
+        if unknown:
+            raise ValueError(f"Node '{ref}' depends on unknown nodes: {sorted(unknown)}")
+        dependencies[ref] = deps
+
+    levels = []
+    placed = set()
+    while len(placed) < len(nodes):
+        level = [ref for ref, deps in dependencies.items()
+                 if ref not in placed and deps <= placed]
+        if not level:
+            cycle = sorted(nodes.keys() - placed)
+            raise ValueError(f"Dependency cycle between nodes: {cycle}")
+        levels.append(level)
+        placed.update(level)
+
+    return levels
+
+
+def _find_created(creator, refs, state):
+    """
+    Look up nodes from an earlier attempt by their marker labels.
+
+    Returns:
+        Dict of node ref -> issue key for the nodes that do exist
+    """
+    found = creator._find_by_markers(state.markers[ref] for ref in refs)
+    return {ref: found[state.markers[ref]] for ref in refs if state.markers[ref] in found}
+
+
+def _bulk_create(creator, project_key, nodes, refs, state):
+    """Create one chunk of nodes with a single bulk create request"""
+    # Nodes attempted before may exist already if the request's outcome was unknown
+    retried = [ref for ref in refs if ref in state.markers]
+    created = {}
+    failed = {}
+    if retried:
+        try:
+            created = _find_created(creator, retried, state)
+        except Exception as e:
+            # Creating them blind could duplicate them; try again on resume
+            failed = {ref: f"Could not check for an earlier create: {e}" for ref in retried}
+    refs = [ref for ref in refs if ref not in created and ref not in failed]
+    if not refs:
+        return created, failed
+
+    issue_fields = []
+    for ref in refs:
+        node = dict(nodes[ref])
+        if node.get("parent") in nodes:
+            node["parent"] = state.keys[node["parent"]]
+        marker = state.markers.setdefault(ref, f"graph-{uuid.uuid4().hex}")
+        node["labels"] = list(node.get("labels", [])) + [marker]
+        issue_fields.append(creator.build_fields(
+            node.pop("project_key", project_key),
+            node.pop("summary"),
+            node.pop("description", ""),
+            **node
+        ))
+
+    for ref, (key, error) in zip(refs, creator.bulk_create(issue_fields)):
+        if key is None:
+            failed[ref] = error
+        else:
+            created[ref] = key
+
+    return created, failed
+
+
+def _create_link(creator, link, state):
+    """Create a single issue link between two created nodes (or existing keys)"""
+    payload = {
+        "type": {"name": link["type"]},
+        "inwardIssue": {"key": state.keys.get(link["inward"], link["inward"])},
+        "outwardIssue": {"key": state.keys.get(link["outward"], link["outward"])},
+    }
+    try:
+        response = creator._send(
+            "POST",
+            f"{creator.jira_url}/rest/api/2/issueLink",
+            headers=creator.headers,
+            data=creator._encode(payload),
+            timeout=10
+        )
+        if response.status_code == 201:
+            return None
+        return f"{response.status_code}: {response.text}"
+    except Exception as e:
+        return str(e)
+
+
+def create_issue_graph(creator, project_key, nodes, links=(), state=None, max_workers=None):
+    """
+    Create a graph of issues and links.
+
+    Args:
+        creator:     JiraStoryCreator
+        project_key: Default project key for nodes that do not set 'project_key'
+        nodes:       Dict of node ref -> fields, using create_story's field names:
+                       {'epic':  {'summary': 'Checkout', 'issue_type': 'Epic'},
+                        'story': {'summary': 'Cart page', 'depends_on': ['epic']},
+                        'task1': {'summary': 'Layout', 'issue_type': 'Sub-task',
+                                  'parent': 'story'}}
+                     'parent' may be a node ref or an existing issue key
+        links:       List of {'type': 'Blocks', 'inward': ref, 'outward': ref}
+                     (refs or existing issue keys)
+        state:       IssueGraphState from an earlier, partially failed run
+                     (every created issue keeps a 'graph-...' marker label)
+        max_workers: Parallel requests per level (defaults to creator.pool_size)
+
+    Returns:
+        IssueGraphState
+    """
+    state = state or IssueGraphState()
+    state.errors = {}
+    max_workers = max_workers or creator.pool_size
+    levels = dependency_levels(nodes)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for depth, level in enumerate(levels):
+            pending = [ref for ref in level if ref not in state.keys]
+            if not pending:
+                continue
+
+            chunks = [pending[i:i + BULK_CREATE_LIMIT]
+                      for i in range(0, len(pending), BULK_CREATE_LIMIT)]
+            futures = [executor.submit(_bulk_create, creator, project_key, nodes, chunk, state)
+                       for chunk in chunks]
+
+            for future in futures:
+                created, failed = future.result()
+                state.keys.update(created)
+                state.errors.update(failed)
+
+            print(f"✓ Level {depth + 1}/{len(levels)}: created {len(pending) - len(state.errors)} "
+                  f"of {len(pending)} issues")
+
+            if state.errors:
+                # Children of failed nodes cannot be created; stop here so
+                # the state can be resumed once the cause is fixed
+                for ref, error in state.errors.items():
+                    print(f"  ✗ {ref}: {error}")
+                return state
+
+        pending_links = [(i, link) for i, link in enumerate(links) if i not in state.links_done]
+        futures = {i: executor.submit(_create_link, creator, link, state)
+                   for i, link in pending_links}
+
+        for i, future in futures.items():
+            error = future.result()
+            if error is None:
+                state.links_done.add(i)
+            else:
+                state.errors[f"link {i}"] = error
+                print(f"  ✗ Link {i}: {error}")
+
+    if pending_links:
+        print(f"✓ Created {len(pending_links) - len(state.errors)} of {len(pending_links)} links")
+
+    return state
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+
+    creator = JiraStoryCreator(
+        jira_url="https://your-server:8443",
+        pat_token="your-personal-access-token",
+        cert_path="/path/to/certificate.pem"
+    )
+
+    nodes = {
+        'epic':   {'summary': 'User authentication', 'issue_type': 'Epic'},
+        'login':  {'summary': 'Login page', 'depends_on': ['epic'], 'priority': 'High'},
+        'reset':  {'summary': 'Password reset', 'depends_on': ['epic']},
+    }
+    for i in range(1, 11):
+        nodes[f'login-{i}'] = {'summary': f'Login sub-task {i}',
+                               'issue_type': 'Sub-task', 'parent': 'login'}
+
+    links = [
+        {'type': 'Blocks', 'inward': 'login', 'outward': 'reset'},
+    ]
+
+    if creator.test_connection():
+        state = create_issue_graph(creator, "PROJ", nodes, links)
+
+        if not state.complete:
+            # Fix the cause, then resume with:
+            #   create_issue_graph(creator, "PROJ", nodes, links,
+            #                      state=IssueGraphState.load("graph_state.json"))
+            state.save("graph_state.json")
@@ -1,25 +1,378 @@
 import requests
 import json
 import os
+import random
+import tarfile
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+from bulk_records import ResultRecord
+from description_document import compile_sections
+from phase_profiler import NO_PHASE, PhaseProfiler, TimedReader
+
+
+class TrafficRecorder:
+    """
+    Append every request made by JiraStoryCreator to an NDJSON log.
+
+    Each line holds the offset from the start of the recording, method,
+    path, request/response sizes, elapsed time, status and the payload, so
+    replay_traffic.py can reproduce the same load shape later.
+    Attachment payloads are recorded as file name and size only.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, method, url, kwargs, response, elapsed):
+        parts = urlsplit(url)
+        payload = None
+        size = 0
+
+        if "files" in kwargs:
+            file_name, f = kwargs["files"]["file"]
+            size = os.fstat(f.fileno()).st_size if hasattr(f, "fileno") else 0
+            payload = {"file": file_name, "size": size}
+        elif kwargs.get("data") is not None:
+            size = len(kwargs["data"])
+            payload = json.loads(kwargs["data"])
+
+        response_size = 0
+        if response is not None:
+            # Streamed bodies (downloads) must not be read here
+            if kwargs.get("stream"):
+                response_size = int(response.headers.get("Content-Length") or 0)
+            else:
+                response_size = len(response.content)
+
+        entry = {
+            "t": round(time.time() - self.started - elapsed, 6),
+            "method": method,
+            "path": parts.path,
+            "params": kwargs.get("params"),
+            "size": size,
+            "elapsed": round(elapsed, 6),
+            "status": response.status_code if response is not None else None,
+            "response_size": response_size,
+            "payload": payload,
+        }
+        line = json.dumps(entry, separators=(",", ":"))
+
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread using a JiraStoryCreator.
+
+    Allows bursts of up to `burst` requests, then `rate` requests per second.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RetryPolicy:
+    """
+    Retry transient create failures with exponential backoff and full jitter.
+
+    A create whose outcome is unknown (timeout, connection reset, 5xx) may
+    have been committed by the server. Every create therefore carries a
+    client-generated marker label, and before re-POSTing an uncertain
+    create the issue is looked up by that label instead, so a retry never
+    produces a duplicate. The marker label stays on the issue.
+
+    The lookup uses the search index; on deployments where indexing lags
+    behind the create (e.g. Cloud), raise base_delay to give it time.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=10,
+                 retry_statuses=(429, 500, 502, 503, 504), marker_prefix="create-id-"):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.marker_prefix = marker_prefix
+
+    def delay(self, retry, retry_after=None):
+        """Seconds to wait before retry number `retry` (1-based)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def new_marker(self):
+        return f"{self.marker_prefix}{uuid.uuid4().hex}"
+
+
+class EndpointPool:
+    """
+    Route requests across several Jira base URLs (cluster nodes or a DR instance).
+
+    Each node keeps a moving average of its response time; requests go to
+    the fastest node whose circuit is closed. After failure_threshold
+    consecutive failures a node's circuit opens and it gets no traffic for
+    cooldown seconds. Then it is half-open: exactly one trial request is let
+    through while other traffic stays on the remaining nodes; success closes
+    the circuit, failure opens it for another cooldown. Health checks
+    (test_connection) are cached for health_ttl seconds; a failed check
+    opens the node's circuit.
+
+    A node's response time is only measured by requests routed to it, so a
+    node that was slow once would never be picked again. Once a node has
+    had no measurement for health_ttl seconds, one request is sent to it as
+    a probe and its average restarts from that request's time.
+    """
+
+    def __init__(self, urls, failure_threshold=3, cooldown=30, health_ttl=60):
+        self.urls = [url.rstrip("/") for url in urls]
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.health_ttl = health_ttl
+        self.latency = {url: 0.0 for url in self.urls}
+        self.measured = {url: time.monotonic() for url in self.urls}
+        self.probing = set()  # Nodes with a latency probe in flight
+        self.failures = {url: 0 for url in self.urls}
+        self.open_until = {url: 0.0 for url in self.urls}
+        self.trial = set()  # Half-open nodes with their trial request in flight
+        self.checked = {}  # url -> (monotonic time, healthy)
+        self._lock = threading.Lock()
+
+    def select(self, exclude=()):
+        """
+        Pick the node for the next request.
+
+        Returns:
+            Base URL, or None if every node is excluded
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [url for url in self.urls if url not in exclude]
+            if not candidates:
+                return None
+            available = [url for url in candidates
+                         if self.open_until[url] <= now and url not in self.trial]
+            if not available:
+                # Everything is failing: try the node that recovers first
+                return min(candidates, key=self.open_until.get)
+
+            stale = [url for url in available if url not in self.probing
+                     and now - self.measured[url] > self.health_ttl]
+            if stale:
+                node = stale[0]
+                self.probing.add(node)
+                self.measured[node] = now  # One probe per health_ttl
+            else:
+                node = min(available, key=self.latency.get)
+            if self.failures[node] >= self.failure_threshold:
+                self.trial.add(node)  # Half-open: this request is the trial
+            return node
+
+    def record_success(self, url, elapsed):
+        with self._lock:
+            previous = self.latency[url]
+            if not previous or url in self.probing:
+                self.latency[url] = elapsed
+            else:
+                self.latency[url] = 0.8 * previous + 0.2 * elapsed
+            self.measured[url] = time.monotonic()
+            self.probing.discard(url)
+            self.failures[url] = 0
+            self.open_until[url] = 0.0
+            self.trial.discard(url)
+
+    def record_failure(self, url):
+        with self._lock:
+            self.trial.discard(url)
+            self.probing.discard(url)
+            self.failures[url] += 1
+            if self.failures[url] >= self.failure_threshold:
+                self.open_until[url] = time.monotonic() + self.cooldown
+                print(f"  ✗ {url} marked unhealthy for {self.cooldown}s")
+
+    def cached_health(self, url):
+        """Cached health check result, or None if missing or expired"""
+        entry = self.checked.get(url)
+        if entry and time.monotonic() - entry[0] < self.health_ttl:
+            return entry[1]
+        return None
+
+    def set_health(self, url, healthy):
+        now = time.monotonic()
+        with self._lock:
+            self.checked[url] = (now, healthy)
+            if not healthy:
+                # A failed health check opens the circuit straight away
+                self.failures[url] = max(self.failures[url], self.failure_threshold)
+                self.open_until[url] = now + self.cooldown
 
 
 class JiraStoryCreator:
-    def __init__(self, jira_url, pat_token, cert_path):
-        self.jira_url = jira_url
+    def __init__(self, jira_url, pat_token, cert_path, record_path=None, pool_size=10,
+                 failover_urls=None, max_requests_per_second=None, profile=False,
+                 retry_policy=None):
+        # jira_url is the primary node; failover_urls are other nodes of the
+        # same cluster (or a DR instance) that requests are routed to when
+        # they are faster or the primary is failing
+        self.jira_url = jira_url.rstrip("/")
+        self.endpoints = EndpointPool([jira_url] + list(failover_urls)) if failover_urls else None
         self.headers = {
             "Authorization": f"Bearer {pat_token}",
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
         self.cert_path = cert_path
+        self.recorder = TrafficRecorder(record_path) if record_path else None
+
+        # profile=True times each phase; profile="cpu", "memory" or "all" also
+        # runs cProfile / tracemalloc per phase. Report with close().
+        self.profiler = None
+        if profile:
+            self.profiler = PhaseProfiler(cpu=profile in ("cpu", "all"),
+                                          memory=profile in ("memory", "all"))
+
+        # Optional RetryPolicy for create_story; None keeps the single attempt
+        self.retry_policy = retry_policy
+
+        # Shared by all threads, so concurrent bulk operations stay under one limit
+        self.rate_limiter = RateLimiter(max_requests_per_second) if max_requests_per_second else None
+
+        # One pooled session keeps TLS connections alive between calls and
+        # lets up to pool_size requests run concurrently from worker threads
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                                pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _phase(self, name):
+        """Context manager timing a phase; a shared no-op when profiling is off"""
+        if self.profiler is None:
+            return NO_PHASE
+        return self.profiler.phase(name)
+
+    def _encode(self, payload):
+        """Encode a request payload as JSON"""
+        with self._phase("json_encode"):
+            return json.dumps(payload)
+
+    def close(self):
+        """Close connections and the traffic log; print the profile report if enabled"""
+        self.session.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.profiler is not None:
+            self.profiler.write_report()
+
+    def _send(self, method, url, **kwargs):
+        """
+        Send an HTTP request to Jira.
+
+        Every call in this class goes through here, so cross-cutting
+        behaviour (traffic recording, node failover, ...) lives in one place.
+
+        Returns:
+            requests.Response
+        """
+        kwargs.setdefault("verify", self.cert_path)
+
+        if self.endpoints is None or not url.startswith(self.jira_url):
+            return self._dispatch(method, url, kwargs)
+
+        # Only idempotent requests are retried on another node; a POST that
+        # failed mid-flight may already have been applied
+        path = url[len(self.jira_url):]
+        retry = method in ("GET", "PUT", "DELETE")
+        tried = []
+
+        while True:
+            node = self.endpoints.select(exclude=tried)
+            tried.append(node)
+            start = time.perf_counter()
+            try:
+                response = self._dispatch(method, node + path, kwargs)
+            except Exception:
+                self.endpoints.record_failure(node)
+                if retry and len(tried) < len(self.endpoints.urls):
+                    continue
+                raise
+
+            if response.status_code >= 500:
+                self.endpoints.record_failure(node)
+                if retry and len(tried) < len(self.endpoints.urls):
+                    continue
+            else:
+                self.endpoints.record_success(node, time.perf_counter() - start)
+            return response
+
+    def _dispatch(self, method, url, kwargs):
+        """Send one request on the pooled session, recording it if enabled"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        if self.recorder is None and self.profiler is None:
+            return self.session.request(method, url, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            with self._phase("http"):
+                response = self.session.request(method, url, **kwargs)
+        except Exception:
+            if self.recorder is not None:
+                self.recorder.record(method, url, kwargs, None, time.perf_counter() - start)
+            raise
+
+        if self.profiler is not None:
+            self.profiler.add("server_wait", response.elapsed.total_seconds())
+        if self.recorder is not None:
+            self.recorder.record(method, url, kwargs, response, time.perf_counter() - start)
+        return response
 
     def test_connection(self):
-        """Test connection to Jira"""
+        """Test connection to Jira (every node, when failover URLs are set)"""
+        if self.endpoints is not None:
+            return self._test_nodes()
+
         try:
-            response = requests.get(
+            response = self._send(
+                "GET",
                 f"{self.jira_url}/rest/api/2/myself",
                 headers=self.headers,
-                verify=self.cert_path,
                 timeout=5
             )
             if response.status_code == 200:
@@ -33,6 +386,42 @@ class JiraStoryCreator:
             print(f"✗ Connection error: {e}")
             return False
 
+    def _test_nodes(self):
+        """
+        Health-check every node, reusing results younger than health_ttl.
+
+        Returns:
+            True if at least one node is healthy
+        """
+        healthy_nodes = 0
+
+        for node in self.endpoints.urls:
+            healthy = self.endpoints.cached_health(node)
+            if healthy is None:
+                start = time.perf_counter()
+                try:
+                    response = self._dispatch(
+                        "GET",
+                        f"{node}/rest/api/2/myself",
+                        {"headers": self.headers, "verify": self.cert_path, "timeout": 5}
+                    )
+                    healthy = response.status_code == 200
+                except Exception as e:
+                    print(f"✗ Connection error ({node}): {e}")
+                    healthy = False
+
+                if healthy:
+                    self.endpoints.record_success(node, time.perf_counter() - start)
+                    print(f"✓ Connected to {node} as: {response.json().get('displayName')}")
+                else:
+                    self.endpoints.record_failure(node)
+                    print(f"✗ Node unhealthy: {node}")
+                self.endpoints.set_health(node, healthy)
+
+            healthy_nodes += healthy
+
+        return healthy_nodes > 0
+
     def build_table(self, rows, headers=None):
         """
         Build a Jira wiki markup table
@@ -62,7 +451,7 @@ class JiraStoryCreator:
 
         return "\n".join(table_rows)
 
-    def build_description(self, sections):
+    def build_description(self, sections, output="wiki"):
         """
         Build a full description with multiple sections, text, and tables.
 
@@ -73,35 +462,53 @@ class JiraStoryCreator:
                 - {'type': 'text',       'text': 'Some paragraph text'}
                 - {'type': 'table',      'rows': [[...]], 'headers': [...]}
                 - {'type': 'divider'}
+            output:   'wiki' for Jira Server wiki markup,
+                      'adf' for an Atlassian Document Format dict (Jira Cloud),
+                      'document' for the compiled DescriptionDocument, which
+                      can be serialized to both without rebuilding
 
         Returns:
-            Full formatted description string
+            Full formatted description string (or ADF dict / document)
         """
-        parts = []
+        with self._phase("build_description"):
+            document = compile_sections(sections)
 
-        for section in sections:
-            section_type = section.get('type')
+            if output == "document":
+                return document
+            if output == "adf":
+                return document.to_adf()
+            return document.to_wiki()
 
-            if section_type == 'heading':
-                parts.append(f"h2. {section['text']}")
+    def build_fields(self, project_key, summary, description="", **kwargs):
+        """
+        Build the 'fields' dict of an issue create payload.
 
-            elif section_type == 'subheading':
-                parts.append(f"h3. {section['text']}")
+        Accepts the same optional fields as create_story; keys it does not
+        know about (comments, attachments, ...) are ignored.
 
-            elif section_type == 'text':
-                parts.append(section['text'])
+        Returns:
+            Fields dict
+        """
+        fields = {
+            "project":     {"key": project_key},
+            "summary":     summary,
+            "description": description,
+            "issuetype":   {"name": kwargs.get("issue_type", "Story")}
+        }
 
-            elif section_type == 'table':
-                table = self.build_table(
-                    rows=section['rows'],
-                    headers=section.get('headers')
-                )
-                parts.append(table)
+        if "priority" in kwargs:
+            fields["priority"] = {"name": kwargs["priority"]}
 
-            elif section_type == 'divider':
-                parts.append("----")
+        if "labels" in kwargs:
+            fields["labels"] = kwargs["labels"]
+
+        if "assignee" in kwargs:
+            fields["assignee"] = {"name": kwargs["assignee"]}
 
-        return "\n\n".join(parts)
+        if "parent" in kwargs:
+            fields["parent"] = {"key": kwargs["parent"]}
+
+        return fields
 
     def create_story(self, project_key, summary, description="", **kwargs):
         """
@@ -117,6 +524,11 @@ class JiraStoryCreator:
                            assignee   - e.g. 'john.doe'
                            comments   - list of comment strings to add after creation
                            attachments - list of file paths to attach after creation
+                           issue_type - e.g. 'Sub-task' (default 'Story')
+                           parent     - parent issue key, for sub-tasks
+                           create_marker - unique label that identifies this create,
+                                        so it can be found again if the outcome is
+                                        unknown (generated by retry_policy if omitted)
 
         Returns:
             Created issue dict, or None on failure
@@ -124,57 +536,307 @@ class JiraStoryCreator:
         endpoint = f"{self.jira_url}/rest/api/2/issue"
 
         payload = {
-            "fields": {
-                "project":     {"key": project_key},
-                "summary":     summary,
-                "description": description,
-                "issuetype":   {"name": "Story"}
-            }
+            "fields": self.build_fields(project_key, summary, description, **kwargs)
         }
+        marker = kwargs.get("create_marker")
 
-        if "priority" in kwargs:
-            payload["fields"]["priority"] = {"name": kwargs["priority"]}
+        try:
+            if self.retry_policy is not None:
+                result = self._create_with_retries(endpoint, payload, marker)
+                if result is None:
+                    return None
+            else:
+                if marker:
+                    payload["fields"]["labels"] = list(payload["fields"].get("labels", [])) + [marker]
+                response = self._send(
+                    "POST",
+                    endpoint,
+                    headers=self.headers,
+                    data=self._encode(payload),
+                    timeout=10
+                )
+                if response.status_code != 201:
+                    print(f"✗ Failed to create story: {response.status_code}")
+                    print(f"  Error: {response.text}")
+                    return None
+                result = response.json()
 
-        if "labels" in kwargs:
-            payload["fields"]["labels"] = kwargs["labels"]
+        except Exception as e:
+            print(f"✗ Error creating story: {e}")
+            return None
 
-        if "assignee" in kwargs:
-            payload["fields"]["assignee"] = {"name": kwargs["assignee"]}
+        issue_key = result.get('key')
+        print(f"✓ Story created: {issue_key}")
+        print(f"  URL: {self.jira_url}/browse/{issue_key}")
+
+        # Add comments if provided
+        if "comments" in kwargs and kwargs["comments"]:
+            for comment in kwargs["comments"]:
+                self.add_comment(issue_key, comment)
+
+        # Add attachments if provided
+        if "attachments" in kwargs and kwargs["attachments"]:
+            for file_path in kwargs["attachments"]:
+                self.add_attachment(issue_key, file_path)
+
+        return result
+
+    def _create_with_retries(self, endpoint, payload, marker=None):
+        """
+        POST an issue under self.retry_policy without ever creating it twice.
+
+        Returns:
+            Created issue dict ({'id', 'key', 'self'}), or None on failure
+        """
+        policy = self.retry_policy
+        marker = marker or policy.new_marker()
+        fields = payload["fields"]
+        fields["labels"] = list(fields.get("labels", [])) + [marker]
+        body = self._encode(payload)
+
+        uncertain = False  # True once an attempt may have been committed
+        retry_after = None
+
+        for attempt in range(1, policy.max_attempts + 1):
+            if attempt > 1:
+                delay = policy.delay(attempt - 1, retry_after)
+                print(f"  ↻ Retrying in {delay:.1f}s (attempt {attempt}/{policy.max_attempts})")
+                time.sleep(delay)
+
+            if uncertain:
+                try:
+                    existing = self._find_by_marker(marker)
+                except Exception as e:
+                    # Never re-POST while the outcome is unknown
+                    print(f"  ✗ Could not check for an earlier attempt: {e}")
+                    continue
+                if existing is not None:
+                    print("  ✓ Earlier attempt had succeeded")
+                    return existing
+
+            retry_after = None
+            try:
+                response = self._send(
+                    "POST",
+                    endpoint,
+                    headers=self.headers,
+                    data=body,
+                    timeout=10
+                )
+            except requests.exceptions.RequestException as e:
+                print(f"✗ Error creating story: {e}")
+                uncertain = True
+                continue
+
+            if response.status_code == 201:
+                return response.json()
+
+            print(f"✗ Failed to create story: {response.status_code}")
+            if response.status_code not in policy.retry_statuses:
+                print(f"  Error: {response.text}")
+                return None
+
+            # 429 means the request was rejected before being applied
+            uncertain = uncertain or response.status_code != 429
+            retry_after = response.headers.get("Retry-After")
+
+        if uncertain:
+            try:
+                existing = self._find_by_marker(marker)
+                if existing is not None:
+                    print("  ✓ Earlier attempt had succeeded")
+                    return existing
+            except Exception as e:
+                print(f"  ✗ Could not check for an earlier attempt: {e}")
+                print(f"  Search for labels = {marker} before creating it again")
+                return None
+
+        print(f"✗ Giving up after {policy.max_attempts} attempts")
+        return None
+
+    def _find_by_marker(self, marker):
+        """
+        Look up an issue by its create marker label.
+
+        Returns:
+            Issue dict ({'id', 'key', 'self'}), or None if it does not exist
+        """
+        page = self.search_page(f'labels = "{marker}"', fields=("summary",), page_size=1)
+        issues = page.get("issues", [])
+        if not issues:
+            return None
+        issue = issues[0]
+        return {"id": issue.get("id"), "key": issue.get("key"), "self": issue.get("self")}
+
+    def _find_by_markers(self, markers):
+        """
+        Look up several issues by their create marker labels in one search.
 
+        Returns:
+            Dict of marker -> issue key, for the markers that exist
+        """
+        markers = set(markers)
+        found = {}
+        jql = f"labels in ({', '.join(sorted(markers))})"
+        for issue in self.search_issues(jql, fields=("labels",), validate_query="warn"):
+            for label in issue["fields"].get("labels") or []:
+                if label in markers:
+                    found[label] = issue["key"]
+        return found
+
+    def bulk_create(self, issue_fields):
+        """
+        Create up to 50 issues with a single /issue/bulk request.
+
+        Args:
+            issue_fields: List of 'fields' dicts (see build_fields)
+
+        Returns:
+            List of (issue_key, error) tuples in input order; exactly one of
+            the two is None for each issue
+        """
         try:
-            response = requests.post(
-                endpoint,
+            response = self._send(
+                "POST",
+                f"{self.jira_url}/rest/api/2/issue/bulk",
                 headers=self.headers,
-                data=json.dumps(payload),
-                verify=self.cert_path,
-                timeout=10
+                data=self._encode({"issueUpdates": [{"fields": f} for f in issue_fields]}),
+                timeout=30
             )
+        except Exception as e:
+            return [(None, str(e))] * len(issue_fields)
 
-            if response.status_code == 201:
-                result = response.json()
-                issue_key = result.get('key')
-                print(f"✓ Story created: {issue_key}")
-                print(f"  URL: {self.jira_url}/browse/{issue_key}")
+        if response.status_code not in (200, 201, 400):
+            return [(None, f"{response.status_code}: {response.text}")] * len(issue_fields)
 
-                # Add comments if provided
-                if "comments" in kwargs and kwargs["comments"]:
-                    for comment in kwargs["comments"]:
-                        self.add_comment(issue_key, comment)
+        try:
+            result = response.json()
+        except ValueError:
+            # E.g. an HTML error page from a proxy
+            return [(None, f"{response.status_code}: {response.text[:200]}")] * len(issue_fields)
 
-                # Add attachments if provided
-                if "attachments" in kwargs and kwargs["attachments"]:
-                    for file_path in kwargs["attachments"]:
-                        self.add_attachment(issue_key, file_path)
+        errors = {}
+        for error in result.get("errors", []):
+            index = error.get("failedElementNumber")
+            if index is not None:
+                errors[index] = json.dumps(error.get("elementErrors", error))
 
-                return result
+        # Created issues come back in request order, skipping failed elements
+        created = iter(result.get("issues", []))
+        outcomes = []
+        for index in range(len(issue_fields)):
+            if index in errors:
+                outcomes.append((None, errors[index]))
+                continue
+            issue = next(created, None)
+            if issue is None:
+                outcomes.append((None, f"{response.status_code}: {response.text}"))
             else:
-                print(f"✗ Failed to create story: {response.status_code}")
-                print(f"  Error: {response.text}")
-                return None
+                outcomes.append((issue["key"], None))
+        return outcomes
 
-        except Exception as e:
-            print(f"✗ Error creating story: {e}")
+    def search_issues(self, jql, fields=("summary",), page_size=100, validate_query="strict"):
+        """
+        Run a JQL search, fetching results one page at a time.
+
+        Args:
+            jql:       JQL query (e.g. 'project = PROJ AND status = "To Do"')
+            fields:    Only these fields are returned, to keep pages small
+            page_size: Issues per request (Jira caps this, usually at 100)
+            validate_query: 'warn' turns unknown keys/values in the JQL into
+                            warnings instead of a failed search
+
+        Yields:
+            Issue dicts ({'key': ..., 'fields': {...}})
+        """
+        start_at = 0
+
+        while True:
+            page = self.search_page(jql, fields, start_at, page_size, validate_query)
+            issues = page.get("issues", [])
+            yield from issues
+
+            start_at += len(issues)
+            if not issues or start_at >= page.get("total", 0):
+                return
+
+    def search_keys(self, issue_keys, fields=("summary",), batch_size=100):
+        """
+        Fetch issues by key, with one 'key in (...)' search per batch.
+
+        Keys are matched case-insensitively and each is reported once. An
+        issue moved to another project comes back from the search under its
+        new key; such keys are fetched one at a time by their old key, so
+        every requested key is paired with its issue.
+
+        Args:
+            issue_keys: Issue keys (e.g. ['PROJ-1', 'proj-2'])
+            fields:     Only these fields are returned
+            batch_size: Keys per search
+
+        Yields:
+            (requested key in upper case, issue dict or None if not found)
+        """
+        keys = list(dict.fromkeys(key.strip().upper() for key in issue_keys))
+
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            wanted = set(batch)
+            found = set()
+            for issue in self.search_issues(f"key in ({', '.join(batch)})", fields=fields,
+                                            validate_query="warn"):
+                if issue["key"] in wanted:
+                    found.add(issue["key"])
+                    yield issue["key"], issue
+
+            for key in batch:
+                if key not in found:
+                    yield key, self._get_issue(key, fields)
+
+    def _get_issue(self, issue_key, fields):
+        """
+        Fetch one issue by key (old keys of moved issues still resolve).
+
+        Returns:
+            Issue dict, or None if it does not exist
+        """
+        response = self._send(
+            "GET",
+            f"{self.jira_url}/rest/api/2/issue/{issue_key}",
+            headers=self.headers,
+            params={"fields": ",".join(fields)},
+            timeout=10
+        )
+        if response.status_code == 404:
             return None
+        if response.status_code != 200:
+            raise RuntimeError(f"Fetching {issue_key} failed: {response.status_code} {response.text}")
+        return response.json()
+
+    def search_page(self, jql, fields=("summary",), start_at=0, page_size=100,
+                    validate_query="strict"):
+        """
+        Fetch one page of a JQL search (see search_issues).
+
+        Returns:
+            Search response dict ({'total': ..., 'issues': [...]})
+        """
+        response = self._send(
+            "POST",
+            f"{self.jira_url}/rest/api/2/search",
+            headers=self.headers,
+            data=self._encode({
+                "jql": jql,
+                "startAt": start_at,
+                "maxResults": page_size,
+                "fields": list(fields),
+                "validateQuery": validate_query
+            }),
+            timeout=30
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"Search failed: {response.status_code} {response.text}")
+        return response.json()
 
     def add_comment(self, issue_key, comment):
         """
@@ -194,11 +856,11 @@ class JiraStoryCreator:
         }
 
         try:
-            response = requests.post(
+            response = self._send(
+                "POST",
                 endpoint,
                 headers=self.headers,
-                data=json.dumps(payload),
-                verify=self.cert_path,
+                data=self._encode(payload),
                 timeout=10
             )
 
@@ -245,11 +907,13 @@ class JiraStoryCreator:
 
         try:
             with open(file_path, "rb") as f:
-                response = requests.post(
+                if self.profiler is not None:
+                    f = TimedReader(f, self.profiler)
+                response = self._send(
+                    "POST",
                     endpoint,
                     headers=attachment_headers,
                     files={"file": (file_name, f)},
-                    verify=self.cert_path,
                     timeout=30  # Larger timeout for file uploads
                 )
 
@@ -269,23 +933,289 @@ class JiraStoryCreator:
             print(f"  ✗ Error attaching file: {e}")
             return None
 
-    def add_attachments(self, issue_key, file_paths):
+    def add_attachments(self, issue_key, file_paths, bundle=False,
+                        bundle_threshold=1024 * 1024, bundle_format="zip",
+                        compress_level=6, manifest="comment", sink=None):
         """
         Add multiple file attachments to an existing Jira issue.
 
         Args:
-            issue_key:  Jira issue key (e.g., 'PROJ-123')
-            file_paths: List of file paths to attach
+            issue_key:        Jira issue key (e.g., 'PROJ-123')
+            file_paths:       List of file paths to attach
+            bundle:           If True, files smaller than bundle_threshold are
+                              packed into a single archive and uploaded once
+            bundle_threshold: Max size in bytes for a file to be bundled
+            bundle_format:    'zip' or 'tar' (tar is gzip compressed)
+            compress_level:   Compression level 0-9 for the archive
+            manifest:         Where to post the manifest table of bundled files:
+                              'comment', 'description' or None
+            sink:             Optional callable; when given, each outcome is passed
+                              to it as a ResultRecord (see bulk_records) instead of
+                              being collected, so large runs use constant memory
 
         Returns:
-            List of results for each attachment attempt
+            List of results for each attachment attempt, None for failures
+            and missing files (the archive upload is a single entry when bundling),
+            or the number of successful uploads when a sink is given
         """
-        results = []
+        if sink is not None:
+            return self._add_attachments_to_sink(
+                issue_key, file_paths, sink, bundle=bundle,
+                bundle_threshold=bundle_threshold, bundle_format=bundle_format,
+                compress_level=compress_level, manifest=manifest
+            )
+
+        if not bundle:
+            results = []
+            for file_path in file_paths:
+                result = self.add_attachment(issue_key, file_path)
+                results.append(result)
+            return results
+
+        small_files = []
+        large_files = []
+        missing = []
         for file_path in file_paths:
-            result = self.add_attachment(issue_key, file_path)
-            results.append(result)
+            if not os.path.exists(file_path):
+                print(f"  ✗ File not found: {file_path}")
+                missing.append(None)  # Same placeholder as without bundling
+                continue
+            if os.path.getsize(file_path) <= bundle_threshold:
+                small_files.append(file_path)
+            else:
+                large_files.append(file_path)
+
+        results = missing + [self.add_attachment(issue_key, path) for path in large_files]
+
+        # A single small file is not worth an archive
+        if len(small_files) == 1:
+            results.append(self.add_attachment(issue_key, small_files[0]))
+            small_files = []
+
+        if small_files:
+            results.append(self._add_attachment_bundle(
+                issue_key, small_files, bundle_format, compress_level, manifest
+            ))
+
         return results
 
+    def add_attachments_as_completed(self, issue_key, file_paths, max_workers=None):
+        """
+        Upload attachments concurrently, yielding each result as it finishes.
+
+        Args:
+            issue_key:   Jira issue key (e.g., 'PROJ-123')
+            file_paths:  List of file paths to attach
+            max_workers: Uploads in flight at once (defaults to pool_size)
+
+        Yields:
+            (index, result) in completion order; index is the position in
+            file_paths and result is as returned by add_attachment.
+            Closing the generator (or breaking out of the loop) cancels the
+            uploads that have not started yet.
+        """
+        calls = ((self.add_attachment, (issue_key, path)) for path in file_paths)
+        return self._as_completed(calls, max_workers)
+
+    def add_comments_as_completed(self, comments, max_workers=None):
+        """
+        Add comments concurrently, yielding each result as it finishes.
+
+        Args:
+            comments:    List of (issue_key, comment) pairs
+            max_workers: Requests in flight at once (defaults to pool_size)
+
+        Yields:
+            (index, result) in completion order, as for add_attachments_as_completed
+        """
+        calls = ((self.add_comment, (issue_key, comment)) for issue_key, comment in comments)
+        return self._as_completed(calls, max_workers)
+
+    def _as_completed(self, calls, max_workers=None):
+        """
+        Run (function, args) calls on a thread pool and yield (index, result)
+        as they complete. Only max_workers calls are submitted at a time, so
+        stopping early leaves the rest unsent.
+        """
+        max_workers = max_workers or self.pool_size
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        calls = enumerate(calls)
+        in_flight = {}
+
+        def submit_next():
+            for index, (function, args) in calls:
+                in_flight[executor.submit(function, *args)] = index
+                return True
+            return False
+
+        try:
+            while len(in_flight) < max_workers and submit_next():
+                pass
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    submit_next()
+                    yield index, future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _add_attachments_to_sink(self, issue_key, file_paths, sink, bundle, **bundle_options):
+        """
+        Upload attachments and pass one ResultRecord per input path to sink.
+
+        Record indexes are positions in file_paths. Bundled files each get a
+        record carrying the archive's attachment id.
+        """
+        uploaded = 0
+
+        def emit(index, result):
+            nonlocal uploaded
+            if result is None:
+                sink(ResultRecord(index, error=f"Upload to {issue_key} failed"))
+                return
+            attachment = result[0] if isinstance(result, list) else result
+            sink(ResultRecord(index, key=attachment.get("id"), status=200))
+            uploaded += 1
+
+        if not bundle:
+            for index, path in enumerate(file_paths):
+                emit(index, self.add_attachment(issue_key, path))
+            return uploaded
+
+        # Large files are uploaded as they are found; only small ones wait
+        small_files = []
+        for index, path in enumerate(file_paths):
+            if not os.path.exists(path):
+                print(f"  ✗ File not found: {path}")
+                sink(ResultRecord(index, error=f"File not found: {path}"))
+            elif os.path.getsize(path) > bundle_options["bundle_threshold"]:
+                emit(index, self.add_attachment(issue_key, path))
+            else:
+                small_files.append((index, path))
+
+        # A single small file is not worth an archive
+        if len(small_files) == 1:
+            emit(small_files[0][0], self.add_attachment(issue_key, small_files[0][1]))
+        elif small_files:
+            result = self._add_attachment_bundle(
+                issue_key, [path for _, path in small_files], bundle_options["bundle_format"],
+                bundle_options["compress_level"], bundle_options["manifest"]
+            )
+            for index, _ in small_files:
+                emit(index, result)
+        return uploaded
+
+    def _add_attachment_bundle(self, issue_key, file_paths, bundle_format,
+                               compress_level, manifest):
+        """
+        Stream files into one archive on disk, upload it and post a manifest.
+
+        Returns:
+            Attachment response for the archive, or None on failure
+        """
+        extension = "zip" if bundle_format == "zip" else "tar.gz"
+        archive_name = f"{issue_key}-attachments.{extension}"
+        rows = []
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            archive_path = os.path.join(temp_dir, archive_name)
+
+            # Files are copied into the archive in chunks, never read whole
+            if bundle_format == "zip":
+                with zipfile.ZipFile(archive_path, "w",
+                                     compression=zipfile.ZIP_DEFLATED,
+                                     compresslevel=compress_level) as archive:
+                    for file_path in file_paths:
+                        archive.write(file_path, self._archive_member_name(file_path, rows))
+            elif bundle_format == "tar":
+                with tarfile.open(archive_path, "w:gz",
+                                  compresslevel=compress_level) as archive:
+                    for file_path in file_paths:
+                        archive.add(file_path, self._archive_member_name(file_path, rows))
+            else:
+                print(f"  ✗ Unsupported bundle format: {bundle_format}")
+                return None
+
+            result = self.add_attachment(issue_key, archive_path)
+
+        if result is None or manifest is None:
+            return result
+
+        manifest_text = self.build_description([
+            {'type': 'heading', 'text': f'Contents of {archive_name}'},
+            {
+                'type': 'table',
+                'headers': ['#', 'File', 'Size (bytes)'],
+                'rows': [[str(i), name, str(size)] for i, (name, size) in enumerate(rows, 1)]
+            },
+        ])
+
+        if manifest == "comment":
+            self.add_comment(issue_key, manifest_text)
+        elif manifest == "description":
+            self._append_to_description(issue_key, manifest_text)
+
+        return result
+
+    def _archive_member_name(self, file_path, rows):
+        """Pick a unique name for file_path inside the archive and record it."""
+        name = os.path.basename(file_path)
+        used = {row[0] for row in rows}
+        stem, ext = os.path.splitext(name)
+        counter = 1
+        while name in used:
+            name = f"{stem}-{counter}{ext}"
+            counter += 1
+        rows.append((name, os.path.getsize(file_path)))
+        return name
+
+    def _append_to_description(self, issue_key, text):
+        """
+        Append wiki markup to the description of an existing Jira issue.
+
+        Returns:
+            True on success, False on failure
+        """
+        endpoint = f"{self.jira_url}/rest/api/2/issue/{issue_key}"
+
+        try:
+            response = self._send(
+                "GET",
+                endpoint,
+                headers=self.headers,
+                params={"fields": "description"},
+                timeout=10
+            )
+            if response.status_code != 200:
+                print(f"  ✗ Failed to read description of {issue_key}: {response.status_code}")
+                return False
+
+            current = response.json().get("fields", {}).get("description") or ""
+            description = f"{current}\n\n{text}" if current else text
+
+            response = self._send(
+                "PUT",
+                endpoint,
+                headers=self.headers,
+                data=self._encode({"fields": {"description": description}}),
+                timeout=10
+            )
+            if response.status_code == 204:
+                print(f"  ✓ Description of {issue_key} updated")
+                return True
+
+            print(f"  ✗ Failed to update description of {issue_key}: {response.status_code}")
+            print(f"    Error: {response.text}")
+            return False
+
+        except Exception as e:
+            print(f"  ✗ Error updating description: {e}")
+            return False
+
 
 # ── Example usage ─────────────────────────────────────────────────────────────
 
@@ -294,51 +1224,58 @@ if __name__ == "__main__":
     creator = JiraStoryCreator(
         jira_url="https://your-server:8443",
         pat_token="your-personal-access-token",
-        cert_path="/path/to/certificate.pem"
+        cert_path="/path/to/certificate.pem",
+        # Optional: log every request for later replay with replay_traffic.py
+        record_path="jira_traffic.ndjson",
+        # Optional: other cluster nodes / DR instance to fail over to
+        failover_urls=["https://your-server-node2:8443"],
+        # Optional: time each phase and print a report on close()
+        profile=True,
+        # Optional: retry timed-out creates without creating duplicates
+        retry_policy=RetryPolicy(max_attempts=4)
     )
 
-    if creator.test_connection():
-
-        # Build description with tables
-        description = creator.build_description([
-            {
-                'type': 'heading',
-                'text': 'Overview'
-            },
-            {
-                'type': 'text',
-                'text': 'This story covers the implementation of the user authentication module.'
-            },
-            {
-                'type': 'heading',
-                'text': 'Acceptance Criteria'
-            },
-            {
-                'type': 'table',
-                'headers': ['#', 'Criteria', 'Priority', 'Status'],
-                'rows': [
-                    ['1', 'User can log in with email and password', 'High',   'To Do'],
-                    ['2', 'User sees error on invalid credentials',  'High',   'To Do'],
-                    ['3', 'Session expires after 30 minutes',        'Medium', 'To Do'],
-                ]
-            },
-            {
-                'type': 'divider'
-            },
-            {
-                'type': 'heading',
-                'text': 'Story Info'
-            },
-            {
-                'type': 'table',
-                'rows': [
-                    ['Release',       'Q1 2026'],
-                    ['Team',          'Platform'],
-                    ['Story Points',  '5'],
-                ]
-            },
-        ])
+    # Build description with tables
+    description = creator.build_description([
+        {
+            'type': 'heading',
+            'text': 'Overview'
+        },
+        {
+            'type': 'text',
+            'text': 'This story covers the implementation of the user authentication module.'
+        },
+        {
+            'type': 'heading',
+            'text': 'Acceptance Criteria'
+        },
+        {
+            'type': 'table',
+            'headers': ['#', 'Criteria', 'Priority', 'Status'],
+            'rows': [
+                ['1', 'User can log in with email and password', 'High',   'To Do'],
+                ['2', 'User sees error on invalid credentials',  'High',   'To Do'],
+                ['3', 'Session expires after 30 minutes',        'Medium', 'To Do'],
+            ]
+        },
+        {
+            'type': 'divider'
+        },
+        {
+            'type': 'heading',
+            'text': 'Story Info'
+        },
+        {
+            'type': 'table',
+            'rows': [
+                ['Release',       'Q1 2026'],
+                ['Team',          'Platform'],
+                ['Story Points',  '5'],
+            ]
+        },
+    ])
 
+    if creator.test_connection():
         # ── Option A: Pass comments and attachments into create_story ──────────
         story = creator.create_story(
             project_key="PROJ",
@@ -363,6 +1300,14 @@ if __name__ == "__main__":
             # Single comment
             creator.add_comment(issue_key, "Follow-up comment added separately.")
 
+            # Sections compiled once can be emitted for either deployment:
+            # to_wiki() for this Server API, to_adf() for Cloud (REST API v3)
+            release_notes = creator.build_description([
+                {'type': 'heading', 'text': 'Release Notes'},
+                {'type': 'table', 'headers': ['Version', 'Date'], 'rows': [['1.4.0', '2026-03-01']]},
+            ], output="document")
+            creator.add_comment(issue_key, release_notes.to_wiki())
+
             # Single attachment
             creator.add_attachment(issue_key, "/path/to/diagram.png")
 
@@ -371,3 +1316,45 @@ if __name__ == "__main__":
                 "/path/to/file1.pdf",
                 "/path/to/file2.xlsx"
             ])
+
+            # Handle each upload as soon as it finishes; stop on the first failure
+            uploads = creator.add_attachments_as_completed(issue_key, [
+                "/path/to/report.html",
+                "/path/to/coverage.xml"
+            ])
+            for index, result in uploads:
+                if result is None:
+                    uploads.close()  # Cancels the uploads not yet started
+                    break
+
+            # Many small artifacts bundled into one archive upload,
+            # with a manifest table posted as a comment
+            creator.add_attachments(issue_key, [
+                "/path/to/screenshot1.png",
+                "/path/to/screenshot2.png",
+                "/path/to/test-run.log",
+                "/path/to/results.csv"
+            ], bundle=True, bundle_threshold=512 * 1024, compress_level=9)
+
+    else:
+        # Jira is unreachable: spool the work instead of dropping it.
+        # `python jira_spool.py drain /var/spool/jira` replays it, in order,
+        # once the server is healthy again.
+        from jira_spool import JiraSpool
+
+        with JiraSpool("/var/spool/jira") as spool:
+            spool.create(
+                project_key="PROJ",
+                summary="Implement user authentication module",
+                description=description,
+                priority="High",
+                labels=["backend", "security"],
+                ref="auth-module"  # Lets the jobs below target the future issue
+            )
+            spool.comment("auth-module", "Initial story created via API.")
+            spool.comment("auth-module", "Design mockups have been reviewed and approved.")
+            spool.attach("auth-module", "/path/to/mockup.png")
+            spool.attach("auth-module", "/path/to/requirements.pdf")
+            print("✓ Story spooled for later")
+
+    creator.close()
@@ -0,0 +1,184 @@
+import json
+
+
+# Intermediate document tree for generated descriptions and comments.
+#
+# build_description sections are compiled once into a DescriptionDocument,
+# which can then be serialized to Jira Server wiki markup or to Atlassian
+# Document Format (ADF, preferred by Jira Cloud) without walking the
+# sections again. Both serializers can stream their output chunk by chunk,
+# so large tables never have to be held as one big string.
+#
+# Text is copied verbatim: wiki markup inside text (e.g. '*bold*') is kept
+# as-is in wiki output and shows up literally in ADF output.
+
+
+class DescriptionDocument:
+    """Compiled description: a flat list of block nodes"""
+
+    # Node shapes:
+    #   ("heading", level, text)
+    #   ("text", text)
+    #   ("table", headers_or_None, rows)  - rows padded to the column count
+    #   ("rule",)
+
+    def __init__(self, nodes=None):
+        self.nodes = nodes or []
+
+    # ── Wiki markup ──────────────────────────────────────────────────────────
+
+    def iter_wiki(self):
+        """Yield wiki markup in chunks (one per heading/paragraph/table row)"""
+        for i, node in enumerate(self.nodes):
+            if i:
+                yield "\n\n"
+
+            kind = node[0]
+            if kind == "heading":
+                yield f"h{node[1]}. {node[2]}"
+
+            elif kind == "text":
+                yield node[1]
+
+            elif kind == "table":
+                headers, rows = node[1], node[2]
+                first = True
+                if headers:
+                    yield "|| " + " || ".join(headers) + " ||"
+                    first = False
+                for row in rows:
+                    prefix = "" if first else "\n"
+                    first = False
+                    yield prefix + "| " + " | ".join(row) + " |"
+
+            elif kind == "rule":
+                yield "----"
+
+    def to_wiki(self):
+        """Full wiki markup string"""
+        return "".join(self.iter_wiki())
+
+    # ── Atlassian Document Format ────────────────────────────────────────────
+
+    @staticmethod
+    def _adf_paragraph(text):
+        # ADF does not allow empty text nodes
+        content = [{"type": "text", "text": text}] if text else []
+        return {"type": "paragraph", "content": content}
+
+    def _adf_table_row(self, cells, cell_type):
+        return {
+            "type": "tableRow",
+            "content": [
+                {"type": cell_type, "content": [self._adf_paragraph(cell)]}
+                for cell in cells
+            ]
+        }
+
+    def _adf_block(self, node):
+        kind = node[0]
+        if kind == "heading":
+            return {
+                "type": "heading",
+                "attrs": {"level": node[1]},
+                "content": [{"type": "text", "text": node[2]}] if node[2] else []
+            }
+        if kind == "text":
+            return self._adf_paragraph(node[1])
+        if kind == "rule":
+            return {"type": "rule"}
+        return None
+
+    def iter_adf_json(self):
+        """
+        Yield the ADF document as JSON text in chunks.
+
+        Tables are emitted one row at a time, so the output can be written
+        to a file or used as a streaming request body.
+        """
+        yield '{"version":1,"type":"doc","content":['
+
+        for i, node in enumerate(self.nodes):
+            if i:
+                yield ","
+
+            if node[0] != "table":
+                yield json.dumps(self._adf_block(node), separators=(",", ":"))
+                continue
+
+            headers, rows = node[1], node[2]
+            yield '{"type":"table","content":['
+            first = True
+            if headers:
+                yield json.dumps(self._adf_table_row(headers, "tableHeader"), separators=(",", ":"))
+                first = False
+            for row in rows:
+                if not first:
+                    yield ","
+                first = False
+                yield json.dumps(self._adf_table_row(row, "tableCell"), separators=(",", ":"))
+            yield "]}"
+
+        yield "]}"
+
+    def to_adf(self):
+        """Full ADF document as a dict"""
+        content = []
+        for node in self.nodes:
+            if node[0] == "table":
+                headers, rows = node[1], node[2]
+                table_rows = []
+                if headers:
+                    table_rows.append(self._adf_table_row(headers, "tableHeader"))
+                table_rows.extend(self._adf_table_row(row, "tableCell") for row in rows)
+                content.append({"type": "table", "content": table_rows})
+            else:
+                content.append(self._adf_block(node))
+        return {"version": 1, "type": "doc", "content": content}
+
+
+def compile_sections(sections):
+    """
+    Compile build_description sections into a DescriptionDocument.
+
+    Args:
+        sections: List of dicts, each with a 'type' key:
+            - {'type': 'heading',    'text': 'My Heading'}
+            - {'type': 'subheading', 'text': 'My Subheading'}
+            - {'type': 'text',       'text': 'Some paragraph text'}
+            - {'type': 'table',      'rows': [[...]], 'headers': [...]}  # headers optional
+            - {'type': 'divider'}
+
+    Returns:
+        DescriptionDocument
+    """
+    nodes = []
+
+    for section in sections:
+        section_type = section.get('type')
+
+        if section_type == 'heading':
+            nodes.append(("heading", 2, section['text']))
+
+        elif section_type == 'subheading':
+            nodes.append(("heading", 3, section['text']))
+
+        elif section_type == 'text':
+            nodes.append(("text", section['text']))
+
+        elif section_type == 'table':
+            rows = section['rows']
+            headers = section.get('headers')
+
+            # Determine column count from headers if available, else from first row
+            col_count = len(headers) if headers else (len(rows[0]) if rows else 0)
+            padded_rows = [
+                [str(cell) for cell in row] + [""] * (col_count - len(row))
+                for row in rows
+            ]
+            nodes.append(("table", list(headers) if headers else None, padded_rows))
+
+        elif section_type == 'divider':
+            nodes.append(("rule",))
+
+    return DescriptionDocument(nodes)
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from bulk_records import ResultRecord
+from create_story_with_table_comments_attachments import JiraStoryCreator
+
+
+# Download attachments from many issues to disk (audits, migrations).
+#
+# Attachments are found with a JQL search (or a key list) that only asks for
+# the 'attachment' field, then downloaded by a bounded worker pool. Bodies
+# are streamed to disk in chunks, never held in memory. A file already on
+# disk with the expected size (and, with verify_hash, the SHA-256 recorded
+# in the manifest) is skipped, and an interrupted download continues from
+# its .part file with an HTTP Range request.
+#
+# Layout:  <out_dir>/<ISSUE-KEY>/<attachment id>-<filename>
+#          <out_dir>/manifest.ndjson   (one line per downloaded file)
+
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_NAME = "manifest.ndjson"
+
+
+class ExportManifest:
+    """Append-only record of downloaded files, with their size and SHA-256"""
+
+    def __init__(self, out_dir):
+        self.path = os.path.join(out_dir, MANIFEST_NAME)
+        self.entries = {}  # attachment id -> entry
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["id"]] = entry
+
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def add(self, entry):
+        with self._lock:
+            self.entries[entry["id"]] = entry
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_attachments(creator, jql=None, issue_keys=None):
+    """
+    Find attachments by JQL or by issue keys.
+
+    Yields:
+        (issue_key, attachment dict) - each attachment id at most once;
+        moved issues are listed under their current key
+    """
+    if jql is not None:
+        issues = creator.search_issues(jql, fields=("attachment",), validate_query="warn")
+    else:
+        issues = _issues_by_key(creator, issue_keys)
+
+    seen = set()
+    for issue in issues:
+        for attachment in issue["fields"].get("attachment") or []:
+            if attachment["id"] not in seen:
+                seen.add(attachment["id"])
+                yield issue["key"], attachment
+
+
+def _issues_by_key(creator, issue_keys):
+    for key, issue in creator.search_keys(issue_keys, fields=("attachment",)):
+        if issue is None:
+            print(f"  ✗ Issue not found: {key}")
+        else:
+            yield issue
+
+
+def _target_path(out_dir, issue_key, attachment):
+    # Keep only the base name so a crafted filename cannot escape out_dir
+    file_name = os.path.basename(attachment["filename"].replace("\\", "/")) or "attachment"
+    return os.path.join(out_dir, issue_key, f"{attachment['id']}-{file_name}")
+
+
+def _is_complete(path, attachment, manifest, verify_hash):
+    if not os.path.exists(path) or os.path.getsize(path) != attachment.get("size"):
+        return False
+    if not verify_hash:
+        return True
+    entry = manifest.entries.get(attachment["id"])
+    return entry is not None and entry.get("sha256") == file_sha256(path)
+
+
+def _range_start(response):
+    """First byte offset of a 206 response ('bytes 100-199/200' -> 100), or None"""
+    content_range = response.headers.get("Content-Range", "")
+    unit, _, spec = content_range.partition(" ")
+    try:
+        return int(spec.split("-", 1)[0]) if unit == "bytes" else None
+    except ValueError:
+        return None
+
+
+def _download(creator, index, issue_key, attachment, out_dir, manifest, verify_hash):
+    path = _target_path(out_dir, issue_key, attachment)
+
+    if _is_complete(path, attachment, manifest, verify_hash):
+        return ResultRecord(index, key=attachment["id"], status=None), "skipped"
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    part_path = path + ".part"
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if attachment.get("size") is not None and offset > attachment["size"]:
+        os.remove(part_path)  # Cannot be a prefix of this attachment
+        offset = 0
+
+    headers = {"Authorization": creator.headers["Authorization"], "Accept": "*/*"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+
+    try:
+        response = creator._send(
+            "GET",
+            attachment["content"],
+            headers=headers,
+            stream=True,
+            timeout=(10, 60)  # Connect, and max wait between chunks
+        )
+        with response:
+            if response.status_code == 416:
+                # Range starts at the end: the .part file is already complete
+                pass
+            elif response.status_code not in (200, 206):
+                return ResultRecord(index, key=attachment["id"], status=response.status_code,
+                                    error=response.text[:200]), "failed"
+            else:
+                if response.status_code == 206 and _range_start(response) != offset:
+                    os.remove(part_path)
+                    return ResultRecord(index, key=attachment["id"], status=206,
+                                        error=f"Unexpected Content-Range: "
+                                              f"{response.headers.get('Content-Range')}"), "failed"
+                # 200 means the server ignored the Range header: start over
+                mode = "ab" if response.status_code == 206 else "wb"
+                with open(part_path, mode) as file:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        file.write(chunk)
+    except Exception as e:
+        return ResultRecord(index, key=attachment["id"], error=str(e)), "failed"
+
+    size = os.path.getsize(part_path)
+    if attachment.get("size") is not None and size != attachment["size"]:
+        os.remove(part_path)  # Start over next run rather than resume from bad data
+        return ResultRecord(index, key=attachment["id"],
+                            error=f"Size mismatch: {size} != {attachment['size']}"), "failed"
+
+    os.replace(part_path, path)
+    manifest.add({
+        "id": attachment["id"],
+        "issue": issue_key,
+        "path": os.path.relpath(path, out_dir),
+        "size": size,
+        "sha256": file_sha256(path),
+    })
+    return ResultRecord(index, key=attachment["id"], status=response.status_code), "downloaded"
+
+
+def export_attachments(creator, out_dir, jql=None, issue_keys=None, max_workers=4,
+                       verify_hash=False, sink=None):
+    """
+    Download all attachments of the matching issues into out_dir.
+
+    Args:
+        creator:     JiraStoryCreator
+        out_dir:     Export directory (reused across runs to skip/resume)
+        jql:         JQL query selecting the issues, or
+        issue_keys:  List of issue keys
+        max_workers: Parallel downloads
+        verify_hash: Also compare existing files with the SHA-256 in the manifest
+        sink:        Optional callable receiving a ResultRecord per attachment
+
+    Returns:
+        Dict with 'downloaded', 'skipped' and 'failed' counts
+    """
+    if (jql is None) == (issue_keys is None):
+        raise ValueError("Pass exactly one of jql or issue_keys")
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = ExportManifest(out_dir)
+    summary = {"downloaded": 0, "skipped": 0, "failed": 0}
+    in_flight = set()
+
+    def drain(done):
+        for future in done:
+            record, outcome = future.result()
+            summary[outcome] += 1
+            if outcome == "failed":
+                print(f"  ✗ Attachment {record.key}: {record.error}")
+            if sink:
+                sink(record)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            attachments = iter_attachments(creator, jql=jql, issue_keys=issue_keys)
+            for index, (issue_key, attachment) in enumerate(attachments):
+                if len(in_flight) >= max_workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    drain(done)
+                in_flight.add(executor.submit(_download, creator, index, issue_key, attachment,
+                                              out_dir, manifest, verify_hash))
+            drain(wait(in_flight).done)
+    finally:
+        manifest.close()
+
+    print(f"✓ Exported attachments to {out_dir}: {summary['downloaded']} downloaded, "
+          f"{summary['skipped']} already present, {summary['failed']} failed")
+    return summary
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+
+    creator = JiraStoryCreator(
+        jira_url="https://your-server:8443",
+        pat_token="your-personal-access-token",
+        cert_path="/path/to/certificate.pem"
+    )
+
+    if creator.test_connection():
+        export_attachments(
+            creator,
+            "/path/to/attachment-export",
+            jql='project = PROJ AND attachments IS NOT EMPTY',
+            max_workers=8
+        )
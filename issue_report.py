@@ -0,0 +1,238 @@
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import product
+
+from create_story_with_table_comments_attachments import JiraStoryCreator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Status / priority / assignee rollups over large JQL result sets.
+#
+# Search pages are fetched concurrently (only the grouped fields are
+# requested) and folded into group-by counters as they arrive, in any
+# order; a page is dropped as soon as it is counted, so memory depends on
+# the number of groups, not the number of issues. With columnar=True a
+# numeric sum_field (e.g. story points) is buffered into typed arrays and
+# accumulated in chunks with numpy.bincount when NumPy is installed.
+# The result renders straight into build_description sections.
+
+
+def _field_values(fields, name):
+    """
+    Grouping values of one field; multi-valued fields (labels, components)
+    count the issue once per value.
+
+    Returns:
+        List of strings
+    """
+    value = fields.get(name)
+
+    if name == "assignee":
+        return [value.get("displayName", "Unassigned") if value else "Unassigned"]
+    if name == "project":
+        return [value.get("key", "None") if value else "None"]
+
+    values = value if isinstance(value, list) else [value]
+    result = []
+    for item in values:
+        if isinstance(item, dict):
+            item = item.get("name") or item.get("value") or item.get("displayName")
+        if item is not None:
+            result.append(str(item))
+    return result or ["None"]
+
+
+class Rollup:
+    def __init__(self, group_by, sum_field=None, columnar=False, chunk_size=10000):
+        """
+        Args:
+            group_by:   Field names to group on, e.g. ('status', 'priority')
+            sum_field:  Optional numeric field to total per group
+                        (e.g. a story points custom field)
+            columnar:   Buffer sum_field values in arrays and accumulate them
+                        in chunks (vectorized with NumPy when available)
+            chunk_size: Values buffered per chunk in columnar mode
+        """
+        self.group_by = tuple(group_by)
+        self.sum_field = sum_field
+        self.counts = Counter()
+        self.sums = defaultdict(float)
+        self.issues = 0
+
+        self.columnar = columnar and sum_field is not None
+        self.chunk_size = chunk_size
+        self._codes = {}             # group -> code
+        self._groups = []            # code -> group
+        self._code_buffer = array("q")
+        self._value_buffer = array("d")
+
+    @property
+    def fields(self):
+        return self.group_by + ((self.sum_field,) if self.sum_field else ())
+
+    def add(self, issue):
+        fields = issue.get("fields", {})
+        self.issues += 1
+
+        value = None
+        if self.sum_field:
+            value = fields.get(self.sum_field)
+            value = float(value) if isinstance(value, (int, float)) else None
+
+        for group in product(*(_field_values(fields, name) for name in self.group_by)):
+            self.counts[group] += 1
+            if value is None:
+                continue
+            if self.columnar:
+                code = self._codes.get(group)
+                if code is None:
+                    code = self._codes[group] = len(self._groups)
+                    self._groups.append(group)
+                self._code_buffer.append(code)
+                self._value_buffer.append(value)
+                if len(self._value_buffer) >= self.chunk_size:
+                    self._flush()
+            else:
+                self.sums[group] += value
+
+    def _flush(self):
+        """Fold buffered (group code, value) pairs into the per-group sums"""
+        if not self._value_buffer:
+            return
+        if np is not None:
+            codes = np.frombuffer(self._code_buffer, dtype=np.int64)
+            values = np.frombuffer(self._value_buffer, dtype=np.float64)
+            totals = np.bincount(codes, weights=values, minlength=len(self._groups))
+            for code in np.flatnonzero(totals):
+                self.sums[self._groups[code]] += float(totals[code])
+        else:
+            for code, value in zip(self._code_buffer, self._value_buffer):
+                self.sums[self._groups[code]] += value
+        self._code_buffer = array("q")
+        self._value_buffer = array("d")
+
+    def rows(self, top=None):
+        """
+        Table rows sorted by count, largest first.
+
+        Returns:
+            List of [group values..., count(, sum)] rows
+        """
+        self._flush()
+        rows = []
+        for group, count in self.counts.most_common(top):
+            row = list(group) + [count]
+            if self.sum_field:
+                row.append(round(self.sums.get(group, 0.0), 2))
+            rows.append(row)
+        return rows
+
+    def to_sections(self, title=None, top=None):
+        """
+        Render the rollup as build_description sections.
+
+        Returns:
+            List of section dicts
+        """
+        headers = [name.capitalize() for name in self.group_by] + ["Count"]
+        if self.sum_field:
+            headers.append(f"Sum of {self.sum_field}")
+
+        rows = self.rows(top)
+        total = ["*Total*"] + [""] * (len(self.group_by) - 1) + [self.issues]
+        if self.sum_field:
+            total.append(round(sum(self.sums.values()), 2))
+
+        sections = []
+        if title:
+            sections.append({'type': 'heading', 'text': title})
+        sections.append({'type': 'table', 'headers': headers, 'rows': rows + [total]})
+        return sections
+
+
+def run_report(creator, jql, group_by, sum_field=None, page_size=100, max_workers=4,
+               columnar=False):
+    """
+    Aggregate every issue matching jql in one streaming pass.
+
+    Args:
+        creator:     JiraStoryCreator
+        jql:         JQL query
+        group_by:    Field names to group on
+        sum_field:   Optional numeric field to total per group
+        page_size:   Issues per search request
+        max_workers: Search pages fetched concurrently
+        columnar:    See Rollup
+
+    Returns:
+        Rollup
+    """
+    rollup = Rollup(group_by, sum_field=sum_field, columnar=columnar)
+    fields = rollup.fields
+
+    first = creator.search_page(jql, fields, 0, page_size)
+    for issue in first.get("issues", []):
+        rollup.add(issue)
+    total = first.get("total", 0)
+
+    # The server may cap maxResults below page_size; step by what it allows
+    step = first.get("maxResults") or len(first.get("issues", [])) or page_size
+
+    # Pages are independent, so they can be counted in completion order;
+    # only a bounded window of pages is in flight at once
+    offsets = iter(range(step, total, step))
+    in_flight = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            for start_at in offsets:
+                in_flight.add(executor.submit(creator.search_page, jql, fields, start_at, step))
+                if len(in_flight) >= max_workers:
+                    break
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                for issue in future.result().get("issues", []):
+                    rollup.add(issue)
+
+    if rollup.issues != total:
+        # Issues added or removed while paging, or pages cut short by the server
+        print(f"✗ Aggregated {rollup.issues} issues but the search reported {total}")
+    print(f"✓ Aggregated {rollup.issues} issues into {len(rollup.counts)} groups")
+    return rollup
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+
+    creator = JiraStoryCreator(
+        jira_url="https://your-server:8443",
+        pat_token="your-personal-access-token",
+        cert_path="/path/to/certificate.pem"
+    )
+
+    if creator.test_connection():
+        by_status = run_report(creator, 'project = PROJ', ('status', 'priority'))
+        by_assignee = run_report(creator, 'project = PROJ AND resolution IS EMPTY',
+                                 ('assignee',), sum_field='customfield_10002', columnar=True)
+
+        description = creator.build_description(
+            by_status.to_sections('Issues by status and priority')
+            + [{'type': 'divider'}]
+            + by_assignee.to_sections('Open work by assignee', top=20)
+        )
+
+        creator.create_story(
+            project_key="PROJ",
+            summary="Weekly status rollup",
+            description=description,
+            labels=["report"]
+        )
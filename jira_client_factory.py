@@ -0,0 +1,135 @@
+from jira import JIRA
+import threading
+
+# Shared, lazily built JIRA clients for the jira-library scripts.
+#
+# JIRA(...) normally probes /serverInfo while it is being constructed, before
+# any real work happens. Clients built here skip that probe, are only created
+# on first use and are memoized per (server, auth, verify), so a script that
+# asks for the same client twice pays for setup once. The deployment type
+# and version that the jira library reads from /serverInfo (Cloud detection,
+# version-gated API calls) are fetched the first time they are needed, once
+# per server.
+
+_clients = {}
+_server_info = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _cache_key(server, token_auth, basic_auth, verify):
+    return (server.rstrip("/"), token_auth, tuple(basic_auth) if basic_auth else None, verify)
+
+
+class _LazyServerInfoJIRA(JIRA):
+    """JIRA client that reads deploymentType and version from /serverInfo on first use"""
+
+    def _lazy_server_info(self):
+        if getattr(self, "_server_info_error", None) is not None:
+            return {}
+        try:
+            return get_server_info(self)
+        except Exception as e:
+            # Behave like get_server_info=False for the rest of this client's
+            # life, rather than repeating a full retry cycle on every read
+            self._server_info_error = e
+            print(f"✗ Could not read server info: {e}")
+            return {}
+
+    @property
+    def deploymentType(self):
+        return self._lazy_server_info().get("deploymentType")
+
+    @deploymentType.setter
+    def deploymentType(self, value):
+        pass  # JIRA.__init__ assigns a placeholder when skipping the probe
+
+    @property
+    def _version(self):
+        return tuple(self._lazy_server_info().get("versionNumbers", (0, 0, 0)))
+
+    @_version.setter
+    def _version(self, value):
+        pass
+
+
+def _build_client(server, token_auth, basic_auth, verify, timeout):
+    return _LazyServerInfoJIRA(
+        server=server,
+        token_auth=token_auth,
+        basic_auth=basic_auth,
+        options={
+            'verify': verify,
+            'async': False
+        },
+        timeout=timeout,
+        get_server_info=False  # Fetched lazily instead of on startup
+    )
+
+
+def get_client(server, token_auth=None, basic_auth=None, verify=True, timeout=10,
+               per_thread=False):
+    """
+    Get a memoized JIRA client.
+
+    Args:
+        server:     Jira base URL (e.g. 'https://your-server:8443')
+        token_auth: Personal access token (Server/Data Center)
+        basic_auth: (email, api_token) tuple (Cloud)
+        verify:     Certificate path, or True/False
+        timeout:    Request timeout in seconds
+        per_thread: If True, each thread gets its own client. The underlying
+                    HTTP session is not safe to share between threads, so use
+                    this when calling Jira from a thread pool.
+
+    Returns:
+        JIRA client
+    """
+    key = _cache_key(server, token_auth, basic_auth, verify)
+
+    if per_thread:
+        clients = getattr(_local, "clients", None)
+        if clients is None:
+            clients = _local.clients = {}
+        if key not in clients:
+            clients[key] = _build_client(server, token_auth, basic_auth, verify, timeout)
+        return clients[key]
+
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _build_client(server, token_auth, basic_auth, verify, timeout)
+                _clients[key] = client
+    return client
+
+
+def get_server_info(client):
+    """
+    Get server info for a client, fetching it at most once per server.
+
+    Returns:
+        Server info dict
+    """
+    server = client.server_url
+    info = _server_info.get(server)
+    if info is None:
+        info = _server_info[server] = client.server_info()
+    return info
+
+
+def clear_clients():
+    """Close and forget all memoized clients in this thread and the shared cache"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _server_info.clear()
+    clients.extend(getattr(_local, "clients", {}).values())
+    _local.clients = {}
+
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
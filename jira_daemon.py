@@ -0,0 +1,340 @@
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+import uuid
+
+
+# Long-running local service that keeps a warm, authenticated JiraStoryCreator.
+#
+# Cron jobs and CI hooks send create / comment / attach jobs over a Unix
+# socket instead of starting a script that imports everything, probes
+# /myself and opens a new TLS connection each time. The daemon pays for that
+# once. Creates arriving from many callers within a short window are
+# coalesced into a single bulk create request; comments are batched the
+# same way, with identical (issue, comment) pairs posted only once. Every
+# coalesced create carries a marker label, so a bulk request whose outcome
+# is unknown (timeout, 5xx) is checked before its callers are told it failed.
+#
+# Protocol: one JSON object per line in each direction.
+#   -> {"op": "create", "args": {"project_key": "PROJ", "summary": "...", ...}}
+#   <- {"ok": true, "result": {"key": "PROJ-123"}}
+#
+# Start:   python jira_daemon.py serve
+# Submit:  python jira_daemon.py create PROJ "Nightly build failed"
+#          python jira_daemon.py comment PROJ-123 "Build 42 failed again"
+#          python jira_daemon.py attach PROJ-123 /path/to/build.log
+#
+# The client side only needs socket and json; everything the daemon itself
+# uses (requests, the creator, thread pools) is imported when it starts, so
+# each submit stays cheap to launch.
+
+DEFAULT_SOCKET = "/tmp/jira_daemon.sock"
+
+
+class CreateCoalescer:
+    """Collect create jobs for up to `window` seconds and send them as one bulk create"""
+
+    def __init__(self, creator, window=0.05, max_batch=50):
+        self.creator = creator
+        self.window = window
+        self.max_batch = max_batch
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, fields):
+        """
+        Queue one issue for creation.
+
+        Returns:
+            Future resolving to the issue key (or raising on failure)
+        """
+        from concurrent.futures import Future
+
+        future = Future()
+        self._jobs.put((fields, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._jobs.get()]
+            if batch[0] is None:
+                return
+
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self._jobs.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._jobs.put(None)  # Finish this batch, then stop
+                    break
+                batch.append(job)
+
+            markers = [f"daemon-{uuid.uuid4().hex}" for _ in batch]
+            issue_fields = [dict(fields, labels=list(fields.get("labels", [])) + [marker])
+                            for (fields, _), marker in zip(batch, markers)]
+            try:
+                outcomes = self.creator.bulk_create(issue_fields)
+            except Exception as e:
+                # Keep the coalescer alive for the next batch
+                print(f"✗ Bulk create of {len(batch)} issues failed: {e}")
+                outcomes = [(None, str(e))] * len(batch)
+
+            if len(batch) > 1:
+                print(f"✓ Coalesced {len(batch)} creates into one request")
+
+            found = self._find_created([marker for marker, (key, _) in zip(markers, outcomes)
+                                        if key is None])
+
+            for (_, future), marker, (key, error) in zip(batch, markers, outcomes):
+                key = key or found.get(marker)
+                if key is None:
+                    future.set_exception(RuntimeError(error))
+                else:
+                    future.set_result(key)
+
+    def _find_created(self, markers):
+        """
+        Issues that were created although their request reported a failure.
+
+        Returns:
+            Dict of marker -> issue key
+        """
+        if not markers:
+            return {}
+        try:
+            return self.creator._find_by_markers(markers)
+        except Exception as e:
+            print(f"✗ Could not check for issues created by a failed request: {e}")
+            return {}
+
+    def close(self):
+        self._jobs.put(None)
+        self._thread.join()
+
+
+class JiraDaemon:
+    def __init__(self, creator, socket_path=DEFAULT_SOCKET, window=0.05, max_workers=None):
+        """
+        Args:
+            creator:     Connected JiraStoryCreator kept for the daemon's lifetime
+            socket_path: Unix socket to listen on (created with 0600 permissions)
+            window:      Seconds to wait for more creates before sending a batch
+            max_workers: Concurrent comments/attachment uploads
+                         (defaults to creator.pool_size)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        from comment_batcher import CommentBatcher
+
+        self.creator = creator
+        self.socket_path = socket_path
+        self.coalescer = CreateCoalescer(creator, window=window)
+        self.comments = CommentBatcher(creator, window=window, max_workers=max_workers)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or creator.pool_size)
+
+    def handle(self, job):
+        """
+        Run one job and build its response.
+
+        Returns:
+            {'ok': True, 'result': ...} or {'ok': False, 'error': '...'}
+        """
+        op = job.get("op")
+        args = job.get("args", {})
+
+        try:
+            if op == "ping":
+                return {"ok": True, "result": "pong"}
+
+            if op == "create":
+                return {"ok": True, "result": self._create(dict(args))}
+
+            if op == "comment":
+                result = self.comments.add(args["issue_key"], args["comment"]).result()
+                if result is None:
+                    return {"ok": False, "error": f"Failed to add comment to {args['issue_key']}"}
+                return {"ok": True, "result": {"id": result.get("id")}}
+
+            if op == "attach":
+                paths = args.get("file_paths") or [args["file_path"]]
+                futures = [self.executor.submit(self.creator.add_attachment, args["issue_key"], path)
+                           for path in paths]
+                failed = [path for path, future in zip(paths, futures) if future.result() is None]
+                if failed:
+                    return {"ok": False, "error": f"Failed to attach: {', '.join(failed)}"}
+                return {"ok": True, "result": {"attached": len(paths)}}
+
+            return {"ok": False, "error": f"Unknown op: {op}"}
+
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def _create(self, args):
+        comments = args.pop("comments", None) or []
+        attachments = args.pop("attachments", None) or []
+        fields = self.creator.build_fields(
+            args.pop("project_key"), args.pop("summary"), args.pop("description", ""), **args
+        )
+
+        key = self.coalescer.submit(fields).result()
+        print(f"✓ Story created: {key}")
+
+        follow_ups = [self.comments.add(key, comment) for comment in comments]
+        follow_ups += [self.executor.submit(self.creator.add_attachment, key, path)
+                       for path in attachments]
+        for future in follow_ups:
+            future.result()
+
+        return {"key": key}
+
+    def _already_running(self):
+        """True if a daemon answers on socket_path"""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            return False
+        finally:
+            probe.close()
+        return True
+
+    def serve_forever(self):
+        import socketserver
+
+        if os.path.exists(self.socket_path):
+            if self._already_running():
+                print(f"✗ A daemon is already listening on {self.socket_path}")
+                self.close()
+                return
+            os.remove(self.socket_path)  # Left behind by a daemon that died
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        response = daemon.handle(json.loads(line))
+                    except ValueError as e:
+                        response = {"ok": False, "error": f"Bad request: {e}"}
+                    self.wfile.write((json.dumps(response) + "\n").encode())
+                    self.wfile.flush()
+
+        # The daemon acts with the Jira credentials, so only this user may
+        # connect; the socket is created with 0600 from the start
+        old_umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        server.daemon_threads = True
+        print(f"✓ Listening on {self.socket_path}")
+
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.close()
+            os.remove(self.socket_path)
+
+    def close(self):
+        self.coalescer.close()
+        self.comments.close()
+        self.executor.shutdown()
+        self.creator.close()
+
+
+class JiraDaemonClient:
+    """Thin client; keeps one connection open for any number of jobs"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=120):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self.file = self.sock.makefile("rwb")
+
+    def submit(self, op, **args):
+        """
+        Send one job and wait for its result.
+
+        File paths are made absolute here: the daemon resolves relative
+        paths against its own working directory, not the caller's.
+
+        Returns:
+            Response dict ({'ok': ..., 'result' or 'error': ...})
+        """
+        if args.get("file_path"):
+            args["file_path"] = os.path.abspath(args["file_path"])
+        for name in ("file_paths", "attachments"):
+            if args.get(name):
+                args[name] = [os.path.abspath(path) for path in args[name]]
+
+        self.file.write((json.dumps({"op": op, "args": args}) + "\n").encode())
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            return {"ok": False, "error": "Daemon closed the connection"}
+        return json.loads(line)
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+
+    if len(sys.argv) < 2:
+        print("Usage: python jira_daemon.py serve | create <project> <summary> [description]"
+              " | comment <issue> <text> | attach <issue> <file>...")
+        sys.exit(1)
+
+    command, args = sys.argv[1], sys.argv[2:]
+
+    if command == "serve":
+        from create_story_with_table_comments_attachments import JiraStoryCreator
+
+        creator = JiraStoryCreator(
+            jira_url="https://your-server:8443",
+            pat_token="your-personal-access-token",
+            cert_path="/path/to/certificate.pem"
+        )
+        if creator.test_connection():
+            JiraDaemon(creator).serve_forever()
+        sys.exit(1)
+
+    with JiraDaemonClient() as client:
+        if command == "create":
+            response = client.submit("create", project_key=args[0], summary=args[1],
+                                     description=args[2] if len(args) > 2 else "")
+        elif command == "comment":
+            response = client.submit("comment", issue_key=args[0], comment=args[1])
+        elif command == "attach":
+            response = client.submit("attach", issue_key=args[0], file_paths=args[1:])
+        else:
+            response = client.submit(command)
+
+    if response["ok"]:
+        print(f"✓ {response['result']}")
+    else:
+        print(f"✗ {response['error']}")
+        sys.exit(1)
@@ -0,0 +1,493 @@
+import fcntl
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from create_story_with_table_comments_attachments import JiraStoryCreator
+
+
+# Durable offline spool for create / comment / attach jobs.
+#
+# Producers append jobs to a segment log on local disk and never wait on
+# Jira: only on a batched fsync (group commit), or not at all with
+# durable=False. A drain worker replays the spooled jobs once Jira is
+# healthy again, as concurrently as the creator's pool allows, while keeping
+# the jobs for any one issue in order.
+#
+# Layout of the spool directory:
+#   segments/<start time>-<pid>.seg  jobs, one JSON line each; every producer
+#                                    process writes its own segments and holds
+#                                    an flock on the one it is appending to
+#   blobs/<uuid>/<file name>         copies of files to attach
+#   acks.log                         jobs the drain worker has finished, plus
+#                                    the issue key created for each ref
+#
+# Jobs are replayed in file order (segment name, then line). A segment is
+# only compacted once its producer has released the lock, i.e. rolled over
+# to a new segment, closed the spool or exited.
+#
+# A create can be given a ref ("build-42") so later comment/attach jobs can
+# target the issue before it exists. Every create carries a marker label;
+# if the drain worker dies mid-create, the next run finds the issue by its
+# marker instead of creating it again.
+
+SEGMENT_BYTES = 16 * 1024 * 1024
+
+
+class _LogWriter:
+    """Append-only line log with batched fsync"""
+
+    def __init__(self, path, fsync_interval=0.05, lock=False):
+        """
+        Args:
+            path:           Log file
+            fsync_interval: Seconds to gather lines before one fsync
+            lock:           Create the file under a temporary name, take an
+                            exclusive flock on it and only then move it into
+                            place, so a reader never sees it unlocked while
+                            this writer has it open
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        if lock:
+            temp_path = path + ".new"
+            self._file = open(temp_path, "ab")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            os.replace(temp_path, path)
+        else:
+            self._file = open(path, "ab")
+        self._sync_directory()
+        self._written = 0   # Lines written
+        self._synced = 0    # Lines known to be on disk
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._sync_loop, daemon=True)
+        self._thread.start()
+
+    def _sync_directory(self):
+        # Make the new file's directory entry durable too
+        fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @property
+    def size(self):
+        return self._file.tell()
+
+    def append(self, entry, durable=True):
+        """
+        Returns:
+            True once written (and fsynced if durable), False if the log was
+            closed first and nothing was written
+        """
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+        with self._condition:
+            if self._closed:
+                return False
+            self._file.write(line)
+            self._written += 1
+            number = self._written
+            self._condition.notify_all()
+            if durable:
+                while self._synced < number and not self._closed:
+                    self._condition.wait()
+            return True
+
+    def _sync_loop(self):
+        while True:
+            with self._condition:
+                while self._synced == self._written and not self._closed:
+                    self._condition.wait()
+                if self._closed and self._synced == self._written:
+                    return
+            # Let more lines pile up, then sync them all at once
+            time.sleep(self.fsync_interval)
+            with self._condition:
+                number = self._written
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._synced = number
+                self._condition.notify_all()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._synced = self._written
+            self._condition.notify_all()
+        self._thread.join()
+        self._file.close()  # Also releases the flock
+
+
+class JiraSpool:
+    """Producer side: append jobs to the spool"""
+
+    def __init__(self, spool_dir, fsync_interval=0.05, segment_bytes=SEGMENT_BYTES):
+        self.spool_dir = spool_dir
+        self.fsync_interval = fsync_interval
+        self.segment_bytes = segment_bytes
+        self.segment_dir = os.path.join(spool_dir, "segments")
+        self.blob_dir = os.path.join(spool_dir, "blobs")
+        os.makedirs(self.segment_dir, exist_ok=True)
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writer = None
+        self._last_start = 0
+
+    def _open_segment(self):
+        # Never name a segment before the previous one, even if the clock
+        # stepped back, so this producer's segments sort in write order
+        self._last_start = max(time.time_ns(), self._last_start + 1)
+        name = f"{self._last_start:020d}-{os.getpid()}.seg"
+        return _LogWriter(os.path.join(self.segment_dir, name), self.fsync_interval, lock=True)
+
+    def _append(self, job, durable):
+        # The append itself runs outside the lock so concurrent producers
+        # share an fsync; if another thread rolled the segment over in
+        # between, the append is refused and goes to the new segment
+        while True:
+            with self._lock:
+                if self._writer is None or self._writer.size >= self.segment_bytes:
+                    if self._writer is not None:
+                        self._writer.close()
+                    self._writer = self._open_segment()
+                writer = self._writer
+            if writer.append(job, durable):
+                return
+
+    def create(self, project_key, summary, description="", ref=None, durable=True, **kwargs):
+        """
+        Spool a create_story call.
+
+        Args:
+            ref:     Optional name that later comment/attach jobs can use as
+                     their target instead of the (not yet known) issue key
+            durable: Wait for the job to be fsynced before returning
+            **kwargs: Optional fields as for create_story (priority, labels, ...)
+        """
+        kwargs.pop("comments", None)
+        kwargs.pop("attachments", None)
+        self._append({
+            "op": "create",
+            "ref": ref,
+            "marker": f"spool-{uuid.uuid4().hex}",
+            "args": dict(kwargs, project_key=project_key, summary=summary, description=description),
+        }, durable)
+
+    def comment(self, target, comment, durable=True):
+        """Spool a comment for an issue key or a create ref"""
+        self._append({"op": "comment", "target": target, "args": {"comment": comment}}, durable)
+
+    def attach(self, target, file_path, durable=True):
+        """
+        Spool an attachment for an issue key or a create ref.
+
+        The file is copied into the spool, so it may change or disappear
+        before the job is drained.
+        """
+        blob_dir = os.path.join(self.blob_dir, uuid.uuid4().hex)
+        os.makedirs(blob_dir)
+        blob_path = os.path.join(blob_dir, os.path.basename(file_path))
+        shutil.copyfile(file_path, blob_path)
+        if durable:
+            with open(blob_path, "rb") as file:
+                os.fsync(file.fileno())
+        blob = os.path.relpath(blob_path, self.spool_dir)
+        self._append({"op": "attach", "target": target, "args": {"blob": blob}}, durable)
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SpoolDrainer:
+    """Consumer side: replay spooled jobs against Jira"""
+
+    def __init__(self, creator, spool_dir, max_workers=None, max_attempts=5):
+        """
+        Args:
+            creator:      JiraStoryCreator to replay jobs with
+            spool_dir:    Spool directory written by JiraSpool
+            max_workers:  Issues processed concurrently (defaults to creator.pool_size)
+            max_attempts: Failures before a job is given up and acked with its error
+        """
+        self.creator = creator
+        self.spool_dir = spool_dir
+        self.segment_dir = os.path.join(spool_dir, "segments")
+        self.max_workers = max_workers or creator.pool_size
+        self.max_attempts = max_attempts
+
+        self.acked = set()
+        self.begun = set()   # Creates that were started, maybe not finished
+        self.refs = {}       # ref -> issue key
+        self.failures = {}   # job id -> failed attempts
+        self._spooled_refs = set()
+        self._lock = threading.Lock()
+
+        acks_path = os.path.join(spool_dir, "acks.log")
+        if os.path.exists(acks_path):
+            with open(acks_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.endswith("\n"):
+                        self._load_ack(json.loads(line))
+        self._acks = _LogWriter(acks_path)
+
+    def _load_ack(self, entry):
+        if entry.get("ref"):
+            self.refs[entry["ref"]] = entry["key"]  # None: the create was given up
+        if entry.get("begin"):
+            self.begun.add(entry["job"])
+        elif entry.get("job"):
+            self.acked.add(entry["job"])
+
+    def _ack(self, job_id, **extra):
+        entry = dict(extra, job=job_id)
+        self._acks.append(entry)
+        with self._lock:
+            self._load_ack(entry)
+
+    def pending_jobs(self):
+        """
+        Read every spooled job that has not been acked yet.
+
+        Returns:
+            List of (job id, job) in file order (segment, then line)
+        """
+        jobs = []
+        for name in self._segments():
+            with open(os.path.join(self.segment_dir, name), "r", encoding="utf-8") as file:
+                for number, line in enumerate(file):
+                    if not line.endswith("\n"):
+                        break  # Line still being written
+                    job_id = f"{name}:{number}"
+                    if job_id not in self.acked:
+                        jobs.append((job_id, json.loads(line)))
+        return jobs
+
+    def _segments(self):
+        return sorted(name for name in os.listdir(self.segment_dir) if name.endswith(".seg"))
+
+    def _group(self, job_id, job):
+        """Jobs with the same group run in order; groups run concurrently"""
+        if job["op"] == "create":
+            return f"ref:{job['ref']}" if job.get("ref") else job_id
+        target = job["target"]
+        return f"ref:{target}" if target in self.refs or target in self._spooled_refs else target
+
+    def _run_job(self, job_id, job):
+        """
+        Returns:
+            True when done (or given up), False to retry the job later
+        """
+        op, args = job["op"], job["args"]
+
+        if op == "create":
+            if job_id in self.begun:
+                # An earlier drain may have created it before stopping
+                existing = self.creator._find_by_marker(job["marker"])
+                if existing is not None:
+                    self._ack(job_id, ref=job.get("ref"), key=existing["key"])
+                    return True
+            else:
+                self._ack(job_id, begin=True)
+
+            args = dict(args)
+            result = self.creator.create_story(
+                args.pop("project_key"), args.pop("summary"), args.pop("description", ""),
+                create_marker=job["marker"], **args
+            )
+            if result is not None:
+                self._ack(job_id, ref=job.get("ref"), key=result["key"])
+                return True
+            return self._failed(job_id, "create failed", ref=job.get("ref"), key=None)
+
+        target = job["target"]
+        is_ref = target in self.refs or target in self._spooled_refs
+        issue_key = self.refs.get(target) if is_ref else target
+        if is_ref and target not in self.refs:
+            return False  # Its create has not run yet
+        if is_ref and issue_key is None:
+            # The create for this ref was given up; nothing to add to
+            self._ack(job_id, error=f"Issue for ref '{target}' was never created")
+            return True
+
+        if op == "comment":
+            result = self.creator.add_comment(issue_key, args["comment"])
+        else:
+            result = self.creator.add_attachment(issue_key, os.path.join(self.spool_dir, args["blob"]))
+
+        if result is not None:
+            self._ack(job_id)
+            return True
+        return self._failed(job_id, f"{op} failed")
+
+    def _failed(self, job_id, error, **extra):
+        self.failures[job_id] = self.failures.get(job_id, 0) + 1
+        if self.failures[job_id] >= self.max_attempts:
+            print(f"  ✗ Giving up on {job_id} after {self.max_attempts} attempts")
+            self._ack(job_id, error=error, **extra)
+            return True
+        return False
+
+    def _run_group(self, jobs):
+        """Run one issue's jobs in order, stopping at the first that must be retried"""
+        done = 0
+        while jobs:
+            job_id, job = jobs[0]
+            try:
+                finished = self._run_job(job_id, job)
+            except Exception as e:
+                extra = {"ref": job.get("ref"), "key": None} if job["op"] == "create" else {}
+                finished = self._failed(job_id, str(e), **extra)
+            if not finished:
+                break
+            jobs.popleft()
+            done += 1
+        return done, len(jobs)
+
+    def drain_once(self):
+        """
+        Replay all pending jobs once.
+
+        Returns:
+            (done, remaining) job counts
+        """
+        jobs = self.pending_jobs()
+        self._spooled_refs = {job["ref"] for _, job in jobs
+                              if job["op"] == "create" and job.get("ref")}
+
+        groups = {}
+        for job_id, job in jobs:
+            group = groups.setdefault(self._group(job_id, job), deque())
+            if job["op"] == "create":
+                # A ref's create always runs before the jobs that target it,
+                # even if another producer's segment sorts first
+                group.appendleft((job_id, job))
+            else:
+                group.append((job_id, job))
+
+        done = remaining = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for group_done, group_remaining in executor.map(self._run_group, groups.values()):
+                done += group_done
+                remaining += group_remaining
+
+        if jobs:
+            print(f"✓ Drained {done} spooled jobs ({remaining} waiting for retry)")
+        return done, remaining
+
+    def compact(self):
+        """
+        Delete fully acked segments and their blobs, and shrink the ack log.
+
+        Segments still locked by a producer are kept, however old they are.
+        """
+        for name in self._segments():
+            path = os.path.join(self.segment_dir, name)
+            with open(path, "r", encoding="utf-8") as file:
+                try:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # A producer is still appending to it
+
+                lines = [line for line in file if line.endswith("\n")]
+                if any(f"{name}:{number}" not in self.acked for number in range(len(lines))):
+                    continue
+
+                for line in lines:
+                    job = json.loads(line)
+                    if job["op"] == "attach":
+                        blob_dir = os.path.dirname(os.path.join(self.spool_dir, job["args"]["blob"]))
+                        shutil.rmtree(blob_dir, ignore_errors=True)
+                os.remove(path)
+            prefix = f"{name}:"
+            self.acked = {job_id for job_id in self.acked if not job_id.startswith(prefix)}
+            self.begun = {job_id for job_id in self.begun if not job_id.startswith(prefix)}
+
+        # Rewrite the ack log with what is still needed
+        acks_path = os.path.join(self.spool_dir, "acks.log")
+        self._acks.close()
+        temp_path = acks_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for ref, key in self.refs.items():
+                file.write(json.dumps({"ref": ref, "key": key}) + "\n")
+            for job_id in self.begun - self.acked:
+                file.write(json.dumps({"job": job_id, "begin": True}) + "\n")
+            for job_id in self.acked:
+                file.write(json.dumps({"job": job_id}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, acks_path)
+        self._acks = _LogWriter(acks_path)
+
+    def run(self, poll_interval=10, max_backoff=300, follow=True):
+        """
+        Wait for Jira to be healthy, drain, repeat.
+
+        Args:
+            poll_interval: Seconds between passes when the spool is empty
+            max_backoff:   Longest wait between health checks while Jira is down
+            follow:        Keep running; if False, return once nothing is left
+        """
+        backoff = poll_interval
+        while True:
+            if not self.pending_jobs():
+                self.compact()
+                if not follow:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            if not self.creator.test_connection():
+                time.sleep(backoff)
+                backoff = min(backoff * 2, max_backoff)
+                continue
+            backoff = poll_interval
+
+            done, remaining = self.drain_once()
+            if remaining:
+                time.sleep(poll_interval)
+
+    def close(self):
+        self._acks.close()
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+#
+#   python jira_spool.py drain /var/spool/jira     # drain until stopped
+#   python jira_spool.py drain-once /var/spool/jira
+
+if __name__ == "__main__":
+
+    if len(sys.argv) != 3 or sys.argv[1] not in ("drain", "drain-once"):
+        print("Usage: python jira_spool.py drain|drain-once <spool_dir>")
+        sys.exit(1)
+
+    creator = JiraStoryCreator(
+        jira_url="https://your-server:8443",
+        pat_token="your-personal-access-token",
+        cert_path="/path/to/certificate.pem"
+    )
+
+    drainer = SpoolDrainer(creator, sys.argv[2])
+    try:
+        drainer.run(follow=sys.argv[1] == "drain")
+    finally:
+        drainer.close()
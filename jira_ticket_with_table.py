@@ -1,6 +1,8 @@
 import requests
 import json
 
+from jira_spool import JiraSpool
+
 
 class JiraStoryCreator:
     def __init__(self, jira_url, pat_token, cert_path):
@@ -166,50 +168,49 @@ if __name__ == "__main__":
         cert_path="/path/to/certificate.pem"
     )
 
-    if creator.test_connection():
-
-        # Build a description with headings, text, and tables
-        description = creator.build_description([
-            {
-                'type': 'heading',
-                'text': 'Overview'
-            },
-            {
-                'type': 'text',
-                'text': 'This story covers the implementation of the user authentication module.'
-            },
-            {
-                'type': 'heading',
-                'text': 'Acceptance Criteria'
-            },
-            {
-                'type': 'table',
-                'headers': ['#', 'Criteria', 'Priority', 'Status'],
-                'rows': [
-                    ['1', 'User can log in with email and password', 'High',   'To Do'],
-                    ['2', 'User sees error on invalid credentials',  'High',   'To Do'],
-                    ['3', 'Session expires after 30 minutes',        'Medium', 'To Do'],
-                    ['4', 'Password reset via email link',           'Medium', 'To Do'],
-                ]
-            },
-            {
-                'type': 'divider'
-            },
-            {
-                'type': 'heading',
-                'text': 'Technical Notes'
-            },
-            {
-                'type': 'table',
-                'headers': ['Component', 'Technology', 'Notes'],
-                'rows': [
-                    ['Auth Service', 'OAuth 2.0',    'Use existing SSO provider'],
-                    ['Database',     'PostgreSQL',   'Users table already exists'],
-                    ['Frontend',     'React',        'Use AuthContext hook'],
-                ]
-            },
-        ])
+    # Build a description with headings, text, and tables
+    description = creator.build_description([
+        {
+            'type': 'heading',
+            'text': 'Overview'
+        },
+        {
+            'type': 'text',
+            'text': 'This story covers the implementation of the user authentication module.'
+        },
+        {
+            'type': 'heading',
+            'text': 'Acceptance Criteria'
+        },
+        {
+            'type': 'table',
+            'headers': ['#', 'Criteria', 'Priority', 'Status'],
+            'rows': [
+                ['1', 'User can log in with email and password', 'High',   'To Do'],
+                ['2', 'User sees error on invalid credentials',  'High',   'To Do'],
+                ['3', 'Session expires after 30 minutes',        'Medium', 'To Do'],
+                ['4', 'Password reset via email link',           'Medium', 'To Do'],
+            ]
+        },
+        {
+            'type': 'divider'
+        },
+        {
+            'type': 'heading',
+            'text': 'Technical Notes'
+        },
+        {
+            'type': 'table',
+            'headers': ['Component', 'Technology', 'Notes'],
+            'rows': [
+                ['Auth Service', 'OAuth 2.0',    'Use existing SSO provider'],
+                ['Database',     'PostgreSQL',   'Users table already exists'],
+                ['Frontend',     'React',        'Use AuthContext hook'],
+            ]
+        },
+    ])
 
+    if creator.test_connection():
         # Create the story
         creator.create_story(
             project_key="PROJ",
@@ -218,6 +219,19 @@ if __name__ == "__main__":
             priority="High",
             labels=["backend", "security"]
         )
+    else:
+        # Jira is unreachable: keep the story in the offline spool instead of
+        # dropping it; `python jira_spool.py drain /var/spool/jira` creates it
+        # once the server is back
+        with JiraSpool("/var/spool/jira") as spool:
+            spool.create(
+                project_key="PROJ",
+                summary="Implement user authentication module",
+                description=description,
+                priority="High",
+                labels=["backend", "security"]
+            )
+            print("✓ Story spooled for later")
 ```
 
 ## What the Table Looks Like in Jira
@@ -0,0 +1,217 @@
+import contextlib
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+
+# Opt-in per-phase timing for JiraStoryCreator runs.
+#
+# Code marks its phases with `with creator._phase("name"):`. When profiling
+# is off the creator hands out one shared no-op context, so the hooks cost
+# next to nothing. When it is on, PhaseProfiler records call counts and
+# wall time per phase and can additionally run cProfile and tracemalloc
+# per phase. write_report() prints (or saves) a summary at the end of a run.
+#
+# Phases run concurrently on worker threads, so each thread gets its own
+# cProfile.Profile per phase; they are merged when the report is built.
+#
+# Phases recorded by JiraStoryCreator:
+#   build_description  - compiling/serializing sections
+#   json_encode        - request payload encoding
+#   http               - full request round trip (connect, TLS, upload, download)
+#   server_wait        - time until response headers arrived (part of http)
+#   file_read          - reading attachment files while uploading (part of http)
+
+NO_PHASE = contextlib.nullcontext()
+
+
+class PhaseStats:
+    __slots__ = ("calls", "total", "max", "memory", "profiles", "unprofiled",
+                 "top_allocations")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.memory = 0          # Net bytes allocated during the phase
+        self.profiles = []       # One cProfile.Profile per thread when cpu profiling
+        self.unprofiled = 0      # Runs cProfile could not attach to
+        self.top_allocations = None  # Allocation diff over the first run (or a claim)
+
+
+class PhaseProfiler:
+    def __init__(self, cpu=False, memory=False, top=15):
+        """
+        Args:
+            cpu:    Run cProfile inside each phase
+            memory: Track net allocations per phase with tracemalloc and keep
+                    the top allocation sites that grew during each phase's
+                    first run
+            top:    Number of functions / allocation sites shown per phase
+        """
+        self.cpu = cpu
+        self.memory = memory
+        self.top = top
+        self.started = time.perf_counter()
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stats(self, name):
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = PhaseStats()
+            return stats
+
+    def _thread_profile(self, name, stats):
+        """This thread's profiler for a phase (one Profile must not be shared by threads)"""
+        profiles = getattr(self._local, "profiles", None)
+        if profiles is None:
+            profiles = self._local.profiles = {}
+        profile = profiles.get(name)
+        if profile is None:
+            profile = profiles[name] = cProfile.Profile()
+            with self._lock:
+                stats.profiles.append(profile)
+        return profile
+
+    def add(self, name, elapsed):
+        """Record a measurement taken elsewhere (e.g. response.elapsed)"""
+        stats = self._stats(name)
+        with self._lock:
+            stats.calls += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        stats = self._stats(name)
+
+        # cProfile allows one active profiler per thread, so nested phases
+        # are only profiled as part of the outermost one
+        profile = None
+        if self.cpu and not getattr(self._local, "profiling", False):
+            profile = self._thread_profile(name, stats)
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12+ allows only one active profiler per process
+                profile = None
+                with self._lock:
+                    stats.unprofiled += 1
+            else:
+                self._local.profiling = True
+
+        # The first run of each phase diffs two snapshots to find what it allocated
+        snapshot_before = None
+        if self.memory:
+            with self._lock:
+                if stats.top_allocations is None:
+                    stats.top_allocations = []  # Claimed by this run
+                    snapshot_before = tracemalloc.take_snapshot()
+
+        memory_before = tracemalloc.get_traced_memory()[0] if self.memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._local.profiling = False
+            elapsed = time.perf_counter() - start
+
+            memory_delta = 0
+            if self.memory:
+                memory_delta = tracemalloc.get_traced_memory()[0] - memory_before
+
+            with self._lock:
+                stats.calls += 1
+                stats.total += elapsed
+                stats.max = max(stats.max, elapsed)
+                stats.memory += memory_delta
+
+            if snapshot_before is not None:
+                # Other threads' allocations in the same window are included
+                ignore = [tracemalloc.Filter(False, tracemalloc.__file__),
+                          tracemalloc.Filter(False, __file__)]
+                growth = tracemalloc.take_snapshot().filter_traces(ignore).compare_to(
+                    snapshot_before.filter_traces(ignore), "lineno")
+                stats.top_allocations = [
+                    str(stat) for stat in growth if stat.size_diff > 0
+                ][:self.top]
+
+    def report(self):
+        """
+        Build the summary report.
+
+        Returns:
+            Report text
+        """
+        run_time = time.perf_counter() - self.started
+        lines = [f"Run time: {run_time:.3f}s", ""]
+        lines.append(f"{'Phase':<20} {'Calls':>8} {'Total s':>10} {'Mean ms':>10} "
+                     f"{'Max ms':>10}" + (f" {'Mem KB':>10}" if self.memory else ""))
+
+        by_total = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+        for name, stats in by_total:
+            mean = stats.total / stats.calls * 1000 if stats.calls else 0
+            line = (f"{name:<20} {stats.calls:>8} {stats.total:>10.3f} {mean:>10.2f} "
+                    f"{stats.max * 1000:>10.2f}")
+            if self.memory:
+                line += f" {stats.memory / 1024:>10.1f}"
+            lines.append(line)
+
+        for name, stats in by_total:
+            profiles = [profile for profile in stats.profiles if profile.getstats()]
+            if profiles:
+                buffer = io.StringIO()
+                merged = pstats.Stats(profiles[0], stream=buffer)
+                for profile in profiles[1:]:
+                    merged.add(profile)
+                merged.sort_stats("cumulative").print_stats(self.top)
+                title = f"── cProfile: {name} ({len(profiles)} threads) ──"
+                lines += ["", title, buffer.getvalue().strip()]
+            if stats.unprofiled:
+                lines += ["", f"({stats.unprofiled} runs of {name} not profiled: "
+                              f"another profiler was active)"]
+            if stats.top_allocations:
+                lines += ["", f"── Allocations during first run: {name} ──"] + stats.top_allocations
+
+        return "\n".join(lines)
+
+    def write_report(self, path=None):
+        """Print the report, or write it to path"""
+        report = self.report()
+        if path is None:
+            print(report)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(report + "\n")
+            print(f"✓ Profile report written to {path}")
+
+
+class TimedReader:
+    """File wrapper that records time spent in read() as the 'file_read' phase"""
+
+    def __init__(self, file, profiler):
+        self._file = file
+        self._profiler = profiler
+
+    def read(self, *args):
+        start = time.perf_counter()
+        data = self._file.read(*args)
+        self._profiler.add("file_read", time.perf_counter() - start)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
@@ -0,0 +1,188 @@
+import requests
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+
+# Replays an NDJSON traffic log written by JiraStoryCreator(record_path=...)
+# against a Jira stand-in, either at the recorded pace or as fast as possible.
+#
+# The bundled stand-in server answers every request with the status and
+# server time that were recorded, so the load shape seen by the client
+# matches production without needing a real Jira. Stand-ins can also be
+# told to fail every request, to exercise JiraStoryCreator's node failover
+# (see check_failover.py).
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answer like Jira would, using the status/delay hints sent by the replayer"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        self.server.requests += 1
+        status = self.server.forced_status or int(self.headers.get("X-Replay-Status") or 200)
+        delay = float(self.headers.get("X-Replay-Delay") or 0)
+        if delay:
+            time.sleep(delay)
+
+        body = b""
+        if status != 204:
+            body = json.dumps({"id": "10000", "key": "REPLAY-1", "displayName": "replay"}).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in(host="127.0.0.1", port=0, status=None):
+    """
+    Start the stand-in server in a background thread.
+
+    Args:
+        status: Answer every request with this status (e.g. 503 for a
+                failing node); change server.forced_status later to recover.
+                server.requests counts the requests received.
+
+    Returns:
+        (server, base_url) - call server.shutdown() when done
+    """
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.forced_status = status
+    server.requests = 0
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def load_log(log_path):
+    """Read a recorded traffic log, ordered by start offset"""
+    with open(log_path, "r", encoding="utf-8") as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+    return sorted(entries, key=lambda entry: entry["t"])
+
+
+def replay_entry(session, base_url, entry, server_time=True):
+    """
+    Send one recorded request.
+
+    Returns:
+        Dict with the recorded and replayed status and elapsed time
+    """
+    headers = {"X-Replay-Status": str(entry.get("status") or 200)}
+    if server_time:
+        headers["X-Replay-Delay"] = str(entry.get("elapsed", 0))
+
+    payload = entry.get("payload")
+    kwargs = {"headers": headers, "params": entry.get("params"), "timeout": 30}
+
+    if payload and "file" in payload:
+        # Attachments are recorded as name + size only; send the same volume
+        headers["X-Atlassian-Token"] = "no-check"
+        kwargs["files"] = {"file": (payload["file"], b"\0" * payload["size"])}
+    elif payload is not None:
+        headers["Content-Type"] = "application/json"
+        kwargs["data"] = json.dumps(payload)
+
+    start = time.perf_counter()
+    try:
+        response = session.request(entry["method"], base_url + entry["path"], **kwargs)
+        status = response.status_code
+    except Exception as e:
+        print(f"  ✗ {entry['method']} {entry['path']}: {e}")
+        status = None
+
+    return {
+        "method": entry["method"],
+        "path": entry["path"],
+        "recorded_status": entry.get("status"),
+        "status": status,
+        "recorded_elapsed": entry.get("elapsed", 0),
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def replay(log_path, base_url, paced=True, max_workers=16, server_time=True):
+    """
+    Replay a recorded traffic log.
+
+    Args:
+        log_path:    NDJSON file written by TrafficRecorder
+        base_url:    Where to send the traffic (e.g. a stand-in server)
+        paced:       If True, requests start at their recorded offsets;
+                     if False, they are sent as fast as max_workers allows
+        max_workers: Max requests in flight at once
+        server_time: Ask the stand-in to hold each response for the recorded time
+
+    Returns:
+        List of per-request result dicts
+    """
+    entries = load_log(log_path)
+    if not entries:
+        print("✗ Nothing to replay")
+        return []
+
+    session = requests.Session()
+    origin = entries[0]["t"]
+    started = time.perf_counter()
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for entry in entries:
+            if paced:
+                wait = (entry["t"] - origin) - (time.perf_counter() - started)
+                if wait > 0:
+                    time.sleep(wait)
+            futures.append(executor.submit(replay_entry, session, base_url, entry, server_time))
+
+    results = [future.result() for future in futures]
+    total = time.perf_counter() - started
+    recorded_total = max(e["t"] + e.get("elapsed", 0) for e in entries) - origin
+    mismatched = sum(1 for r in results if r["status"] != r["recorded_status"])
+
+    print(f"✓ Replayed {len(results)} requests in {total:.2f}s "
+          f"(recorded: {recorded_total:.2f}s)")
+    if mismatched:
+        print(f"  ✗ {mismatched} responses differed from the recorded status")
+
+    return results
+
+
+# ── Example usage ─────────────────────────────────────────────────────────────
+#
+#   python replay_traffic.py jira_traffic.ndjson            # recorded pace
+#   python replay_traffic.py jira_traffic.ndjson --fast     # as fast as possible
+#   python replay_traffic.py jira_traffic.ndjson --fast http://localhost:8080
+
+if __name__ == "__main__":
+
+    if len(sys.argv) < 2:
+        print("Usage: python replay_traffic.py <log.ndjson> [--fast] [base_url]")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    fast = "--fast" in args
+    args = [arg for arg in args if arg != "--fast"]
+    log_path = args[0]
+
+    if len(args) > 1:
+        replay(log_path, args[1], paced=not fast)
+    else:
+        server, base_url = start_stand_in()
+        try:
+            replay(log_path, base_url, paced=not fast)
+        finally:
+            server.shutdown()
@@ -1,23 +1,16 @@
-from jira import JIRA
+from jira_client_factory import get_client
 
 # Configuration
 JIRA_URL = "https://your-server:8443"
 PAT_TOKEN = "your-personal-access-token"
 CERT_PATH = "/path/to/your/certificate.pem"
 
-# Connect using PAT
-jira = JIRA(
-    server=JIRA_URL,
-    token_auth=PAT_TOKEN,  # Use token_auth instead of basic_auth
-    options={
-        'verify': CERT_PATH,  # Path to your certificate
-        'async': False
-    },
-    timeout=10
-)
-
 # Test connection
 try:
+    # Connect using PAT (token_auth instead of basic_auth).
+    # The client is built on first use and reused by later get_client calls.
+    jira = get_client(JIRA_URL, token_auth=PAT_TOKEN, verify=CERT_PATH)
+
     current_user = jira.current_user()
     print(f"✓ Connected as: {current_user}")
     
@@ -1,12 +1,8 @@
-from jira import JIRA
+from jira_client_factory import get_client
 
-# Connect
-jira = JIRA(
-    server="https://your-server:8443",
-    token_auth="your-personal-access-token",
-    options={'verify': '/path/to/certificate.pem', 'async': False},
-    timeout=10
-)
+JIRA_URL = "https://your-server:8443"
+PAT_TOKEN = "your-personal-access-token"
+CERT_PATH = "/path/to/certificate.pem"
 
 # Create a simple story
 def create_story():
@@ -18,6 +14,7 @@ def create_story():
     }
     
     try:
+        jira = get_client(JIRA_URL, token_auth=PAT_TOKEN, verify=CERT_PATH)
         new_story = jira.create_issue(fields=story_fields)
         print(f"✓ Story created successfully!")
         print(f"  Issue Key: {new_story.key}")
@@ -1,13 +1,13 @@
-from jira import JIRA
+from jira_client_factory import get_client
 import json
 
-# Connect to Jira
-jira = JIRA(
-    server='https://your-domain.atlassian.net',
-    basic_auth=('your-email@example.com', 'your-api-token')
-)
+JIRA_URL = 'https://your-domain.atlassian.net'
+BASIC_AUTH = ('your-email@example.com', 'your-api-token')
 
 def create_stories_with_library(json_file_path):
+    # Connect to Jira (built lazily, reused across calls)
+    jira = get_client(JIRA_URL, basic_auth=BASIC_AUTH)
+
     with open(json_file_path, 'r') as file:
         data = json.load(file)
     